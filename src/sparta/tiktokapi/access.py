@@ -11,7 +11,16 @@ Examples:
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await create_bearer_token(client_key, client_secret)
+        print(bearer_token)
+
+    Get a cached bearer token that is refreshed shortly before it expires::
+
+        from sparta.tiktokapi.access import get_bearer_token
+
+        client_key = "your_client_key"
+        client_secret = "your_client_secret"
+        bearer_token = await get_bearer_token(client_key, client_secret)
         print(bearer_token)
 
     Get headers for API requests::
@@ -21,13 +30,43 @@ Examples:
         bearer_token = "your_bearer_token"
         headers = get_header(bearer_token)
         print(headers)
+
+    Get the per-request authorization header for the shared session::
+
+        from sparta.tiktokapi.access import get_authorization_header
+
+        bearer_token = "your_bearer_token"
+        headers = get_authorization_header(bearer_token)
+        print(headers)
 """
-from typing import Dict
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+import orjson
+
+from sparta.tiktokapi.exceptions import TikTokAPIError
+from sparta.tiktokapi.session import DEFAULT_HEADERS, get_session, read_error_body
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL = "https://open.tiktokapis.com/v2/oauth/token/"
+TOKEN_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Cache-Control": "no-cache",
+}
+GRANT_TYPE = "client_credentials"
+TOKEN_EXPIRY_SKEW = 60
 
-import requests
+_bearer_tokens: Dict[str, Tuple[str, float]] = {}
+_bearer_token_lock: Optional[asyncio.Lock] = None
+_bearer_token_loop: Optional[asyncio.AbstractEventLoop] = None
 
 
-def create_bearer_token(client_key: str, client_secret: str) -> str:
+async def create_bearer_token(client_key: str, client_secret: str, session: Optional[aiohttp.ClientSession] = None) -> str:
     """Creates a bearer token for TikTok API authentication.
 
     This function sends a request to the TikTok API to generate a bearer token using the provided client key and client secret.
@@ -35,27 +74,72 @@ def create_bearer_token(client_key: str, client_secret: str) -> str:
     Args:
         client_key (str): The client key provided by TikTok for API access.
         client_secret (str): The client secret provided by TikTok for API access.
+        session (Optional[aiohttp.ClientSession], optional): The session used for the request. Defaults to the shared session.
 
     Returns:
         str: The bearer token to be used for authentication in subsequent API requests.
 
     Raises:
-        Exception: If the request to the API fails or returns an error.
+        TikTokAPIError: If the request to the API fails or returns an error.
     """
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Cache-Control": "no-cache",
-    }
+    response_json = await _request_bearer_token(client_key, client_secret, session)
+    return response_json["access_token"]
+
+
+async def get_bearer_token(client_key: str, client_secret: str, session: Optional[aiohttp.ClientSession] = None) -> str:
+    """Returns a cached bearer token for TikTok API authentication.
+
+    A bearer token is valid for about two hours. This function keeps one token per client key and client secret and only requests a new one when the cached
+    token expires within the next :data:`TOKEN_EXPIRY_SKEW` seconds. Concurrent callers share a single refresh.
 
+    Args:
+        client_key (str): The client key provided by TikTok for API access.
+        client_secret (str): The client secret provided by TikTok for API access.
+        session (Optional[aiohttp.ClientSession], optional): The session used to request a new token. Defaults to the shared session.
+
+    Returns:
+        str: The bearer token to be used for authentication in subsequent API requests.
+
+    Raises:
+        TikTokAPIError: If the request to the API fails or returns an error.
+    """
+    key = hashlib.sha256(f"{client_key}|{client_secret}".encode()).hexdigest()
+    async with _get_bearer_token_lock():
+        cached = _bearer_tokens.get(key)
+        if cached is not None and time.monotonic() < cached[1] - TOKEN_EXPIRY_SKEW:
+            return cached[0]
+
+        response_json = await _request_bearer_token(client_key, client_secret, session)
+        bearer_token = response_json["access_token"]
+        _bearer_tokens[key] = (bearer_token, time.monotonic() + response_json.get("expires_in", 0))
+        return bearer_token
+
+
+def _get_bearer_token_lock() -> asyncio.Lock:
+    """Returns the lock of the running event loop, creating it if the loop has changed, since a lock can only be awaited in one event loop."""
+    global _bearer_token_lock, _bearer_token_loop
+    loop = asyncio.get_running_loop()
+    if _bearer_token_lock is None or _bearer_token_loop is not loop:
+        _bearer_token_lock = asyncio.Lock()
+        _bearer_token_loop = loop
+    return _bearer_token_lock
+
+
+async def _request_bearer_token(client_key: str, client_secret: str, session: Optional[aiohttp.ClientSession]) -> Dict:
+    """Requests a new bearer token and returns the JSON response of the TikTok API."""
     data = {
         "client_key": client_key,
         "client_secret": client_secret,
-        "grant_type": "client_credentials",
+        "grant_type": GRANT_TYPE,
     }
 
-    response = requests.post("https://open.tiktokapis.com/v2/oauth/token/", headers=headers, data=data)
-    bearer_token = response.json()["access_token"]
-    return bearer_token
+    session = session or await get_session()
+    async with session.post(TOKEN_URL, headers=TOKEN_HEADERS, data=data) as response:
+        if not response.ok:
+            error = TikTokAPIError(response.status, await read_error_body(response), TOKEN_URL)
+            logger.error("Cannot create bearer token (HTTP %s): %s", error.status, error.body)
+            raise error
+        return orjson.loads(await response.read())
 
 
 def get_header(bearer_token: str) -> Dict:
@@ -69,5 +153,19 @@ def get_header(bearer_token: str) -> Dict:
     Returns:
         Dict: A dictionary containing the headers for the API request.
     """
-    headers = {"Authorization": f"Bearer {bearer_token}", "content-type": "application/json"}
-    return headers
+    return {**get_authorization_header(bearer_token), **DEFAULT_HEADERS}
+
+
+def get_authorization_header(bearer_token: str) -> Dict:
+    """Generates the authorization header for a single TikTok API request.
+
+    The shared session (see :mod:`sparta.tiktokapi.session`) only carries the :data:`DEFAULT_HEADERS`, so the bearer token is sent per request. This allows
+    one session to be reused with different bearer tokens.
+
+    Args:
+        bearer_token (str): The bearer token for authentication.
+
+    Returns:
+        Dict: A dictionary containing the authorization header for the API request.
+    """
+    return {"Authorization": f"Bearer {bearer_token}"}
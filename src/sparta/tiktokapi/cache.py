@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""cache.py: Optional caching of TikTok API responses.
+
+The query functions accept any cache with the interface of :class:`ResponseCache`, e.g. a ``diskcache.Cache`` that persists the responses across
+processes, or a :class:`MemoryCache` that keeps them in memory.
+
+Examples:
+    Answer repeated queries from memory::
+
+        from sparta.tiktokapi.cache import MemoryCache
+        from sparta.tiktokapi.users.user import query_user_info
+
+        cache = MemoryCache()
+        user_info = await query_user_info(bearer_token, "example_user", cache=cache)
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+import orjson
+
+PAGE_CACHE_TTL = 30 * 60
+MEMORY_CACHE_SIZE = 128
+
+
+class ResponseCache(Protocol):
+    """Interface of the optional response cache, e.g. a ``diskcache.Cache``."""
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the value cached for ``key`` or ``default``."""
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> Any:
+        """Caches ``value`` for ``key``, expiring after ``expire`` seconds."""
+
+
+class MemoryCache:
+    """A small in-memory :class:`ResponseCache` for notebooks and tests that run the same queries again.
+
+    The least recently used responses are evicted once ``maxsize`` responses are cached, expired responses when they are looked up.
+
+    Args:
+        maxsize (int, optional): The maximum number of cached responses. Defaults to :data:`MEMORY_CACHE_SIZE`.
+    """
+
+    def __init__(self, maxsize: int = MEMORY_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Tuple[Any, Optional[float]]] = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the value cached for ``key`` or ``default`` if there is none or it has expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        """Caches ``value`` for ``key``, expiring after ``expire`` seconds."""
+        self._entries[key] = (value, time.monotonic() + expire if expire is not None else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return True
+
+
+def cache_key(url: str, params: Optional[Dict], body: Optional[Dict]) -> str:
+    """Returns the key of a request in the response cache.
+
+    Args:
+        url (str): The URL of the TikTok API endpoint.
+        params (Optional[Dict]): The query parameters of the request.
+        body (Optional[Dict]): The JSON body of the request.
+
+    Returns:
+        str: A hash of the URL and the canonical JSON of the query parameters and the body.
+    """
+    canonical_json = orjson.dumps([params, body], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(url.encode() + canonical_json).hexdigest()
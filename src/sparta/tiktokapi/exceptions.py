@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""exceptions.py: Exceptions raised by the TikTok API functions.
+
+Examples:
+    Handle a failed query::
+
+        from sparta.tiktokapi.exceptions import TikTokAPIError
+        from sparta.tiktokapi.users.user import query_user_info
+
+        try:
+            user_info = await query_user_info(bearer_token, "example_user")
+        except TikTokAPIError as error:
+            print(error.status, error.body)
+"""
+
+
+from typing import Optional
+
+
+class TikTokAPIError(Exception):
+    """Raised if the TikTok API responds with an HTTP error or cannot be reached.
+
+    Attributes:
+        status (Optional[int]): The HTTP status of the response, or None if the request timed out or the connection failed.
+        body (str): The body of the response, usually a JSON object with an ``error`` field, or the description of the connection error.
+        endpoint (str): The URL of the queried TikTok API endpoint.
+    """
+
+    def __init__(self, status: Optional[int], body: str, endpoint: str) -> None:
+        reason = f"HTTP {status}" if status is not None else "no response"
+        super().__init__(f"Cannot query {endpoint} ({reason}): {body}")
+        self.status = status
+        self.body = body
+        self.endpoint = endpoint
@@ -22,12 +22,21 @@ Examples:
         )
         print(video)
 
+    Validate the response of an endpoint::
+
+        from sparta.tiktokapi.models.model import TiktokResponse, UserInfoObject
+
+        tiktokresponse = TiktokResponse[UserInfoObject].model_validate(response_json)
+        print(tiktokresponse.data)
+
 Source: https://developers.tiktok.com/doc/research-api-codebook/
 """
-from typing import Dict, List, Optional, Union
+from typing import Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
 
+T = TypeVar("T")
+
 
 class Error(BaseModel):
     code: str
@@ -145,8 +154,6 @@ class UserFollowingData(BaseModel):
     has_more: bool = Field(..., description="Whether there are more accounts this user is following / has more followers or not or not.")
 
 
-class TiktokResponse(BaseModel):
-    data: Union[
-        QueryVideoResponseData, ResearchVideoCommentsData, UserInfoObject, UserLikedVideosData, UserPinnedVideosData, UserFollowerData, UserFollowingData, Dict
-    ]
+class TiktokResponse(BaseModel, Generic[T]):
+    data: T
     error: Error
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""pagination.py: Pagination of TikTok API endpoints that return their results page by page.
+
+Examples:
+    Iterate over the followers of a user::
+
+        from sparta.tiktokapi.models.model import UserFollowerData
+        from sparta.tiktokapi.pagination import paginate
+
+        async for user in paginate(session, url, body, params, headers, data_model=UserFollowerData, items_attr="user_followers"):
+            print(user)
+"""
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Type, Union
+
+import aiohttp
+from pydantic import BaseModel
+
+from sparta.tiktokapi.cache import PAGE_CACHE_TTL, ResponseCache
+from sparta.tiktokapi.exceptions import TikTokAPIError
+from sparta.tiktokapi.session import is_retryable_status, post_with_retry, retry_delay
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_RETRIES = 3
+
+_full_body_urls: Set[str] = set()
+
+
+def clear_full_body_urls() -> None:
+    """Forgets the endpoints that rejected the reduced bodies of ``continuation``, so that the following queries try them again."""
+    _full_body_urls.clear()
+
+
+async def paginate_pages(
+    session: aiohttp.ClientSession,
+    url: str,
+    body: Dict,
+    params: Dict,
+    headers: Dict,
+    data_model: Type[BaseModel],
+    items_attr: str,
+    carry: Tuple[str, ...] = ("cursor", "search_id"),
+    cache: Optional[ResponseCache] = None,
+    cache_ttl: Optional[float] = PAGE_CACHE_TTL,
+    retry_on: Optional[Callable[[TikTokAPIError, Dict], bool]] = None,
+    max_retries: Optional[int] = MAX_PAGE_RETRIES,
+    checkpoint: Optional[Callable[[Dict], Awaitable[None]]] = None,
+    continuation: Optional[Tuple[str, ...]] = None,
+    **kwargs: Any,
+) -> AsyncGenerator[List, None]:
+    """Queries all pages of a paginated TikTok API endpoint.
+
+    The ``data`` of every response is validated with ``data_model`` and the list of items in its ``items_attr`` is yielded. As long as the API reports
+    ``has_more``, the fields listed in ``carry`` are copied from the response into ``body`` to request the next page.
+
+    The pages are requested by a background task, which requests the next page as soon as the caller has taken the current one. This way, the next request
+    is already on its way while the caller processes the current page, and a caller that stops early has cost at most one extra request.
+
+    If ``continuation`` is given, the following pages are requested with only these fields and the fields of ``carry``, so that large queries are not sent
+    again for every page. If such a request fails with HTTP 400, the page is requested again with the whole body. Unless ``retry_on`` handles the error,
+    the endpoint is remembered as requiring the whole body, which is then sent for all its following requests until :func:`clear_full_body_urls` is called.
+
+    Args:
+        session (aiohttp.ClientSession): The session used for the requests.
+        url (str): The URL of the TikTok API endpoint.
+        body (Dict): The body of the first request. It is updated with the fields of ``carry`` for each following request.
+        params (Dict): The query parameters of the requests.
+        headers (Dict): The headers of the requests, e.g. the authorization header.
+        data_model (Type[BaseModel]): The model of the ``data`` field of the responses.
+        items_attr (str): The attribute of ``data_model`` holding the list of items.
+        carry (Tuple[str, ...], optional): The fields of ``data_model`` that are sent with the next request. Fields that ``data_model`` does not have are
+          skipped. Defaults to ``("cursor", "search_id")``.
+        cache (Optional[ResponseCache], optional): The cache for the pages, see :func:`~sparta.tiktokapi.session.post_with_retry`. Defaults to no caching.
+        cache_ttl (Optional[float], optional): The number of seconds a page is kept in the cache. Defaults to :data:`~sparta.tiktokapi.cache.PAGE_CACHE_TTL`.
+        retry_on (Optional[Callable[[TikTokAPIError, Dict], bool]], optional): Decides whether a page that failed with an error other than a rate limit or
+          a server error is requested again after :func:`~sparta.tiktokapi.session.retry_delay` seconds. It is called with the error and ``body`` and may
+          update ``body`` for the next attempt. Defaults to raising such errors.
+        max_retries (Optional[int], optional): The maximum number of times a page is requested again because of ``retry_on``, or None for no limit.
+          Defaults to :data:`MAX_PAGE_RETRIES`.
+        checkpoint (Optional[Callable[[Dict], Awaitable[None]]], optional): Called with the fields of ``carry`` that request the next page, once the caller
+          has processed a page that is followed by another one. Persist them to resume the query later. Defaults to None.
+        continuation (Optional[Tuple[str, ...]], optional): The fields of ``body`` that are sent with the fields of ``carry`` to request the following pages,
+          or None to always send the whole body. Defaults to None.
+        **kwargs (Any): Further arguments passed to :func:`~sparta.tiktokapi.session.post_with_retry`, e.g. ``max_attempts`` or ``timeout``.
+
+    Yields:
+        List: The items of each page.
+
+    Raises:
+        TikTokAPIError: If an HTTP error occurs or the query fails.
+    """
+    pages: asyncio.Queue[Union[Tuple[List, Optional[Dict]], BaseException, None]] = asyncio.Queue(maxsize=1)
+
+    async def fetch_pages() -> None:
+        try:
+            attempt = 0
+            removed: Dict = {}
+            while True:
+                try:
+                    # The errors that are raised immediately are logged below, once it is clear whether they are handled.
+                    response_json = await post_with_retry(
+                        session, url, cache=cache, cache_ttl=cache_ttl, client_error_level=logging.INFO, params=params, json=body, headers=headers, **kwargs
+                    )
+                except TikTokAPIError as error:
+                    # A reduced body may be what the endpoint rejects, so any retry of it sends the whole body again.
+                    rejected_reduced_body = bool(removed) and error.status == 400
+                    if rejected_reduced_body:
+                        body.update(removed)
+                        removed = {}
+                    recoverable = retry_on is not None and retry_on(error, body)
+
+                    if rejected_reduced_body and not recoverable:
+                        logger.info("Cannot continue querying %s without the whole body, send the whole body instead.", url)
+                        _full_body_urls.add(url)
+                        continue
+                    if not recoverable:
+                        if error.status is not None and not is_retryable_status(error.status):
+                            logger.error("Cannot query %s (HTTP %s): %s", url, error.status, error.body)
+                        raise
+                    if max_retries is not None and attempt >= max_retries:
+                        logger.error("Abort querying %s after %s retries.", url, attempt)
+                        raise
+
+                    delay = retry_delay(None, attempt)
+                    attempt += 1
+                    logger.info("Retry querying %s in %.0f seconds.", url, delay)
+                    await asyncio.sleep(delay)
+                    continue
+
+                attempt = 0
+                # pydantic-core validates the items of the list field in one pass, so this is as fast as validating only the items with a TypeAdapter
+                # and also checks the pagination fields. Decoding with orjson first is as fast as model_validate_json on the raw body and keeps the
+                # decoded responses cacheable.
+                data = data_model.model_validate(response_json["data"])
+                items = getattr(data, items_attr)
+                has_more = getattr(data, "has_more", False)
+
+                next_page = None
+                if has_more:
+                    for field in carry:
+                        value = getattr(data, field, None)
+                        if value is not None:
+                            body[field] = value
+                    next_page = {field: body[field] for field in carry if field in body}
+                    if continuation is not None and not removed and url not in _full_body_urls:
+                        removed = {field: body.pop(field) for field in list(body) if field not in continuation and field not in carry}
+
+                # Only keep the items, so that the response is not held in memory while the page waits for the caller and the next page is requested.
+                del response_json, data
+                await pages.put((items, next_page))
+                # Only request the following page once the caller has taken this one, so that the task never runs more than one page ahead.
+                await pages.join()
+                if not has_more:
+                    break
+        except Exception as error:
+            await pages.put(error)
+        else:
+            await pages.put(None)
+
+    task = asyncio.create_task(fetch_pages())
+    try:
+        while True:
+            page = await pages.get()
+            pages.task_done()
+            if page is None:
+                break
+            if isinstance(page, BaseException):
+                raise page
+
+            items, next_page = page
+            yield items
+            if checkpoint is not None and next_page is not None:
+                await checkpoint(next_page)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def paginate(*args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+    """Queries all pages of a paginated TikTok API endpoint and yields their items one by one.
+
+    Args:
+        *args (Any): The arguments of :func:`paginate_pages`.
+        **kwargs (Any): The keyword arguments of :func:`paginate_pages`.
+
+    Yields:
+        Any: Each item of each page.
+
+    Raises:
+        TikTokAPIError: If an HTTP error occurs or the query fails.
+    """
+    async with aclosing(paginate_pages(*args, **kwargs)) as pages:
+        async for page in pages:
+            for item in page:
+                yield item
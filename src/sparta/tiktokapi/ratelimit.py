@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ratelimit.py: Client-side pacing of TikTok API requests.
+
+Examples:
+    Share the rate limit of a bearer token between queries::
+
+        from sparta.tiktokapi.ratelimit import get_rate_limiter
+
+        rate_limiter = get_rate_limiter(bearer_token)
+        await rate_limiter.acquire()
+"""
+import asyncio
+import logging
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+MAX_RPS = 5.0
+MIN_RPS = 0.5
+RATE_RECOVERY = 30.0
+
+_rate_limiters: Dict[str, "RateLimiter"] = {}
+
+
+class RateLimiter:
+    """Paces requests so that they stay below the rate limit of the TikTok API.
+
+    Requests are spaced evenly at the current rate, which starts at ``max_rps`` requests per second. Whenever the TikTok API answers with HTTP 429, the rate
+    is halved down to ``min_rps``. After every ``recovery`` seconds without another HTTP 429, it is increased again by one request per second up to
+    ``max_rps``.
+
+    Args:
+        max_rps (float, optional): The maximum number of requests per second. Defaults to :data:`MAX_RPS`.
+        min_rps (float, optional): The minimum number of requests per second. Defaults to :data:`MIN_RPS`.
+        recovery (float, optional): The number of seconds without HTTP 429 after which the rate is increased. Defaults to :data:`RATE_RECOVERY`.
+    """
+
+    def __init__(self, max_rps: float = MAX_RPS, min_rps: float = MIN_RPS, recovery: float = RATE_RECOVERY) -> None:
+        self.max_rps = max_rps
+        self.min_rps = min(min_rps, max_rps)
+        self.recovery = recovery
+        self.rate = max_rps
+        self._next_slot = 0.0
+        self._last_change = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Waits until the next request may be sent."""
+        now = time.monotonic()
+        recovered = int((now - self._last_change) // self.recovery)
+        if recovered and self.rate < self.max_rps:
+            self.rate = min(self.max_rps, self.rate + recovered)
+            self._last_change = now
+
+        # The slot is reserved before sleeping, so that concurrent requests queue up behind each other.
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def decrease(self) -> None:
+        """Halves the rate after the TikTok API answered with HTTP 429."""
+        self.rate = max(self.min_rps, self.rate / 2)
+        self._last_change = time.monotonic()
+        logger.info("Decrease the request rate to %.2f requests per second.", self.rate)
+
+
+def get_rate_limiter(bearer_token: str, max_rps: float = MAX_RPS) -> RateLimiter:
+    """Returns the rate limiter shared by all queries with the same bearer token.
+
+    The limiter is created on first use with ``max_rps``. Its settings are fixed from then on, so that a query cannot change the pace of other queries
+    that are already running with the same bearer token. Later calls return the existing limiter, whatever ``max_rps`` they pass.
+
+    Args:
+        bearer_token (str): The bearer token the rate limit applies to.
+        max_rps (float, optional): The maximum number of requests per second if the limiter is created. Defaults to :data:`MAX_RPS`.
+
+    Returns:
+        RateLimiter: The rate limiter of the bearer token.
+    """
+    rate_limiter = _rate_limiters.get(bearer_token)
+    if rate_limiter is None:
+        rate_limiter = _rate_limiters[bearer_token] = RateLimiter(max_rps)
+    return rate_limiter
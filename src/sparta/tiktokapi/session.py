@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""session.py: Shared HTTP session for TikTok API requests.
+
+This module manages a single aiohttp.ClientSession that is shared by all query functions, so that connections to the TikTok API are pooled and reused instead
+of being opened and closed for every query. The session only carries the default headers, the bearer token is sent with each request. Responses are
+requested compressed and decompressed transparently.
+
+Examples:
+    Use the shared session and close it on shutdown::
+
+        from sparta.tiktokapi.session import close_session
+        from sparta.tiktokapi.users.user import query_user_info
+
+        user_info = await query_user_info(bearer_token, "example_user")
+        await close_session()
+
+    Pass an own session to the query functions::
+
+        from sparta.tiktokapi.session import create_session
+        from sparta.tiktokapi.users.user import query_user_info
+
+        async with create_session() as session:
+            user_info = await query_user_info(bearer_token, "example_user", session=session)
+"""
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import aiohttp
+import orjson
+
+from sparta.tiktokapi.cache import ResponseCache, cache_key
+from sparta.tiktokapi.exceptions import TikTokAPIError
+from sparta.tiktokapi.ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {"content-type": "application/json", "Accept-Encoding": "gzip, deflate, br"}
+CONNECTOR_LIMIT = 100
+CONNECTOR_LIMIT_PER_HOST = 64
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 75
+TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10)
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def json_dumps(obj: Any) -> str:
+    """Serializes request bodies with orjson, which is considerably faster than the json module of the standard library."""
+    return orjson.dumps(obj).decode()
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Creates a session tuned for the TikTok API.
+
+    All endpoints are served by the same host, so the connector keeps connections alive, caches DNS lookups and allows many parallel connections to that
+    host. The timeout prevents requests from hanging indefinitely. Request bodies are serialized with orjson.
+
+    Returns:
+        aiohttp.ClientSession: A new session with the default headers.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTOR_LIMIT,
+        limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(headers=DEFAULT_HEADERS, connector=connector, timeout=TIMEOUT, json_serialize=json_dumps)
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Returns the shared session, creating it on first use.
+
+    A new session is created if there is none yet, if it has been closed or if it was created in another event loop. This does not await anything, so
+    concurrent callers cannot create two sessions and no lock is needed, which would be bound to a single event loop.
+
+    Returns:
+        aiohttp.ClientSession: The session shared by all query functions.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = create_session()
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    """Closes the shared session.
+
+    Call this once on shutdown to release the pooled connections. A later query creates a new session, even while the old one is still closing.
+    """
+    global _session, _session_loop
+    session = _session
+    _session = None
+    _session_loop = None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def retry_delay(response: Optional[aiohttp.ClientResponse], attempt: int) -> float:
+    """Returns the number of seconds to wait before retrying a failed request.
+
+    The ``Retry-After`` header of the response is used if present, either as a number of seconds or as an HTTP date. Otherwise the delay grows exponentially
+    with the attempt and is capped at :data:`BACKOFF_CAP`, plus a random jitter so that parallel requests do not retry at the same time.
+
+    Args:
+        response (Optional[aiohttp.ClientResponse]): The response of the failed request, if any.
+        attempt (int): The number of the failed attempt, starting at 0.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after is not None:
+        if retry_after.isdigit():
+            return float(retry_after)
+        try:
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    return min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt) + random.uniform(0, BACKOFF_BASE)
+
+
+def is_retryable_status(status: int) -> bool:
+    """Checks whether a request that failed with an HTTP status is retried by :func:`post_with_retry`, i.e. whether it was rate limited or hit a server
+    error.
+    """
+    return status == 429 or status >= 500
+
+
+async def read_error_body(response: aiohttp.ClientResponse) -> str:
+    """Reads the body of a failed response once for the error and its log message.
+
+    The body is decoded as UTF-8, which the TikTok API uses for all responses, so that aiohttp does not have to guess the charset of error responses that do
+    not declare one.
+
+    Args:
+        response (aiohttp.ClientResponse): The failed response.
+
+    Returns:
+        str: The decoded body, with undecodable bytes replaced.
+    """
+    return (await response.read()).decode("utf-8", errors="replace")
+
+
+async def post_with_retry(
+    session: aiohttp.ClientSession,
+    url: str,
+    max_attempts: Optional[int] = MAX_ATTEMPTS,
+    max_duration: Optional[float] = None,
+    cache: Optional[ResponseCache] = None,
+    cache_ttl: Optional[float] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    client_error_level: int = logging.ERROR,
+    **kwargs: Any,
+) -> Dict:
+    """Sends a POST request and retries it if the TikTok API is rate limited or unavailable.
+
+    Requests that fail with HTTP 429, a server error, a timeout or a connection error are retried after :func:`retry_delay` seconds, until either
+    ``max_attempts`` attempts have been made or the next retry would start more than ``max_duration`` seconds after the first attempt. Any other HTTP error is
+    raised immediately.
+
+    If a cache is given, a response cached for the same URL, query parameters and body is returned without sending the request, and successful responses are
+    added to the cache.
+
+    Args:
+        session (aiohttp.ClientSession): The session used for the request.
+        url (str): The URL of the TikTok API endpoint.
+        max_attempts (Optional[int], optional): The maximum number of attempts, or None for no limit. Defaults to :data:`MAX_ATTEMPTS`.
+        max_duration (Optional[float], optional): The maximum number of seconds to keep retrying, or None for no limit. Defaults to None.
+        cache (Optional[ResponseCache], optional): The cache for the responses. Defaults to no caching.
+        cache_ttl (Optional[float], optional): The number of seconds a response is kept in the cache. Defaults to no expiry.
+        rate_limiter (Optional[RateLimiter], optional): The rate limiter that paces each attempt and is slowed down by HTTP 429. Defaults to no pacing.
+        client_error_level (int, optional): The log level of HTTP errors that are raised immediately. Lower it if the caller handles some of them and logs
+          the others itself. Defaults to ``logging.ERROR``.
+        **kwargs (Any): Further arguments passed to :meth:`aiohttp.ClientSession.post`, e.g. ``params``, ``json`` or ``headers``.
+
+    Returns:
+        Dict: The JSON response of the TikTok API.
+
+    Raises:
+        TikTokAPIError: If an HTTP error occurs or the request still fails after ``max_attempts`` attempts or ``max_duration`` seconds. Its ``status`` is
+          None if the last attempt timed out or could not connect.
+    """
+    body = kwargs.pop("json", None)
+    if cache is not None:
+        key = cache_key(url, kwargs.get("params"), body)
+        cached_response_json = cache.get(key)
+        if cached_response_json is not None:
+            return cached_response_json
+
+    # Serialize the body once to bytes instead of letting aiohttp encode the string of json_serialize again for every attempt.
+    body_bytes = orjson.dumps(body) if body is not None else None
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        if body_bytes is not None:
+            kwargs["data"] = aiohttp.BytesPayload(body_bytes, content_type="application/json")
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        try:
+            async with session.post(url, **kwargs) as response:
+                if response.ok:
+                    response_json = orjson.loads(await response.read())
+                    if cache is not None:
+                        cache.set(key, response_json, expire=cache_ttl)
+                    return response_json
+
+                error = TikTokAPIError(response.status, await read_error_body(response), url)
+                if not is_retryable_status(response.status):
+                    logger.log(client_error_level, "Cannot query %s (HTTP %s): %s", url, error.status, error.body)
+                    raise error
+
+                logger.error("Temporarily cannot query %s (HTTP %s): %s", url, error.status, error.body)
+                if rate_limiter is not None and response.status == 429:
+                    rate_limiter.decrease()
+                delay = retry_delay(response, attempt)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as client_error:
+            error = TikTokAPIError(None, str(client_error) or type(client_error).__name__, url)
+            error.__cause__ = client_error
+            logger.error("Temporarily cannot query %s: %s", url, error.body)
+            delay = retry_delay(None, attempt)
+
+        attempt += 1
+        if max_attempts is not None and attempt >= max_attempts:
+            logger.error("Abort querying %s after %s attempts.", url, attempt)
+            raise error
+        if max_duration is not None and time.monotonic() - start + delay > max_duration:
+            logger.error("Abort querying %s after %.0f seconds.", url, time.monotonic() - start)
+            raise error
+
+        await asyncio.sleep(delay)
@@ -8,12 +8,12 @@ It includes asynchronous implementations to handle API requests efficiently and
 Examples:
     Retrieve user information::
 
-        from sparta.tiktokapi.access import create_bearer_token
+        from sparta.tiktokapi.access import get_bearer_token
         from sparta.tiktokapi.users.user import query_user_info
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await get_bearer_token(client_key, client_secret)
         username = "example_user"
 
         user_info = await query_user_info(bearer_token, username)
@@ -21,12 +21,12 @@ Examples:
 
     Retrieve user followers::
 
-        from sparta.tiktokapi.access import create_bearer_token
+        from sparta.tiktokapi.access import get_bearer_token
         from sparta.tiktokapi.users.user import query_user_followers
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await get_bearer_token(client_key, client_secret)
         username = "example_user"
 
         async for follower in query_user_followers(bearer_token, username):
@@ -34,31 +34,54 @@ Examples:
 
     Retrieve user following::
 
-        from sparta.tiktokapi.access import create_bearer_token
+        from sparta.tiktokapi.access import get_bearer_token
         from sparta.tiktokapi.users.user import query_user_following
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await get_bearer_token(client_key, client_secret)
         username = "example_user"
 
         async for following in query_user_following(bearer_token, username):
             print(following)
+
+    Retrieve information about many users in parallel::
+
+        from sparta.tiktokapi.access import get_bearer_token
+        from sparta.tiktokapi.users.user import query_many_user_info
+
+        client_key = "your_client_key"
+        client_secret = "your_client_secret"
+        bearer_token = await get_bearer_token(client_key, client_secret)
+        usernames = ["example_user", "another_user"]
+
+        for username, user_info in await query_many_user_info(bearer_token, usernames):
+            print(username, user_info)
 """
 import asyncio
 import logging
-from typing import AsyncGenerator, Dict, Optional
+from typing import AsyncGenerator, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
-from sparta.tiktokapi.access import get_header
+from sparta.tiktokapi.access import get_authorization_header
+from sparta.tiktokapi.cache import ResponseCache
 from sparta.tiktokapi.models.constants import USER_INFO_FIELDS
-from sparta.tiktokapi.models.model import TiktokResponse, UserFollowerData, UserFollowerInfoObject, UserFollowingData, UserInfoObject
+from sparta.tiktokapi.models.model import UserFollowerData, UserFollowerInfoObject, UserFollowingData, UserInfoObject
+from sparta.tiktokapi.pagination import paginate
+from sparta.tiktokapi.session import get_session, post_with_retry
 
 logger = logging.getLogger(__name__)
 
+QUERY_USER_INFO_URL = "https://open.tiktokapis.com/v2/research/user/info/"
+QUERY_USER_FOLLOWERS_URL = "https://open.tiktokapis.com/v2/research/user/followers/"
+QUERY_USER_FOLLOWING_URL = "https://open.tiktokapis.com/v2/research/user/following/"
+USER_INFO_CACHE_TTL = 6 * 60 * 60
+
 
-async def query_user_info(bearer_token: str, username: str) -> UserInfoObject:
+async def query_user_info(
+    bearer_token: str, username: str, session: Optional[aiohttp.ClientSession] = None, cache: Optional[ResponseCache] = None
+) -> UserInfoObject:
     """Asynchronously retrieves information about a TikTok user.
 
     This function queries the TikTok API to get detailed information about a user based on their username (https://open.tiktokapis.com/v2/research/user/info/).
@@ -66,29 +89,64 @@ async def query_user_info(bearer_token: str, username: str) -> UserInfoObject:
     Args:
         bearer_token (str): The bearer token for authentication.
         username (str): The username of the TikTok user.
+        session (Optional[aiohttp.ClientSession], optional): The session used for the request. Defaults to the shared session.
+        cache (Optional[ResponseCache], optional): A cache for the responses, e.g. a ``diskcache.Cache``. Defaults to no caching.
 
     Returns:
         UserInfoObject: An object containing the user's information.
 
     Raises:
-        Exception: If an HTTP error occurs or the query fails.
+        TikTokAPIError: If an HTTP error occurs or the query fails.
+    """
+    session = session or await get_session()
+    headers = get_authorization_header(bearer_token)
+    params = {"fields": USER_INFO_FIELDS}
+    body = {"username": username}
+    logger.debug("Query user info body=%s", body)
+    response_json = await post_with_retry(session, QUERY_USER_INFO_URL, cache=cache, cache_ttl=USER_INFO_CACHE_TTL, params=params, json=body, headers=headers)
+    return UserInfoObject.model_validate(response_json["data"])
+
+
+async def query_many_user_info(
+    bearer_token: str, usernames: List[str], concurrency: int = 64, session: Optional[aiohttp.ClientSession] = None, cache: Optional[ResponseCache] = None
+) -> List[Tuple[str, Union[UserInfoObject, Exception]]]:
+    """Asynchronously retrieves information about many TikTok users in parallel.
+
+    This function runs :func:`query_user_info` for all usernames at once, with at most ``concurrency`` requests in flight. A failing query does not abort the
+    others, its exception is returned in place of the user's information.
+
+    Args:
+        bearer_token (str): The bearer token for authentication.
+        usernames (List[str]): The usernames of the TikTok users.
+        concurrency (int, optional): The maximum number of parallel requests. Defaults to 64.
+        session (Optional[aiohttp.ClientSession], optional): The session used for the requests. Defaults to the shared session.
+        cache (Optional[ResponseCache], optional): A cache for the responses, e.g. a ``diskcache.Cache``. Defaults to no caching.
+
+    Returns:
+        List[Tuple[str, Union[UserInfoObject, Exception]]]: The username and either the user's information or the exception of its query, in the order of
+          ``usernames``.
+
+    Raises:
+        ValueError: If ``concurrency`` is less than 1.
     """
-    async with aiohttp.ClientSession(headers=get_header(bearer_token)) as session:
-        params = {"fields": USER_INFO_FIELDS}
-        body = {"username": username}
-        logger.debug(f"Query video body={body}")
-        async with session.post("https://open.tiktokapis.com/v2/research/user/info/", params=params, json=body) as response:
-            if not response.ok:
-                logger.error(f"Cannot query user info (HTTP {response.status}): {await response.text()}")
-                raise Exception
-
-            tiktokresponse = TiktokResponse.model_validate(await response.json())
-            data = tiktokresponse.data
-            assert isinstance(data, UserInfoObject)
-            return data
-
-
-async def query_user_followers(bearer_token: str, username: str, max_count: Optional[int] = 100) -> AsyncGenerator[UserFollowerInfoObject, None]:
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, not {concurrency}")
+    session = session or await get_session()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded_query_user_info(username: str) -> Tuple[str, Union[UserInfoObject, Exception]]:
+        async with semaphore:
+            try:
+                return username, await query_user_info(bearer_token, username, session=session, cache=cache)
+            except Exception as error:
+                return username, error
+
+    return await asyncio.gather(*[bounded_query_user_info(username) for username in usernames])
+
+
+async def query_user_followers(
+    bearer_token: str, username: str, max_count: Optional[int] = 100, session: Optional[aiohttp.ClientSession] = None, cache: Optional[ResponseCache] = None
+) -> AsyncGenerator[UserFollowerInfoObject, None]:
     """Asynchronously retrieves the followers of a TikTok user.
 
     This function queries the TikTok API to get a list of followers for the specified user. It handles rate limiting and pagination of results
@@ -99,43 +157,28 @@ async def query_user_followers(bearer_token: str, username: str, max_count: Opti
         username (str): The username of the TikTok user.
         max_count (Optional[int], optional): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
           than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession], optional): The session used for the requests. Defaults to the shared session.
+        cache (Optional[ResponseCache], optional): A cache for the responses, e.g. a ``diskcache.Cache``. Defaults to no caching.
 
     Yields:
         UserFollowerInfoObject: An object representing each follower.
 
     Raises:
-        Exception: If an HTTP error occurs or the query fails.
+        TikTokAPIError: If an HTTP error occurs or the query fails.
     """
-    async with aiohttp.ClientSession(headers=get_header(bearer_token)) as session:
-        params: Dict = {}
-        body = {"username": username, "max_count": max_count}
-        logger.debug(f"Query user folowers body={body}")
-
-        while True:
-            async with session.post("https://open.tiktokapis.com/v2/research/user/followers/", params=params, json=body) as response:
-                if response.status == 429:
-                    logger.error(f"Too Many Requests (HTTP {response.status}): {await response.text()}")
-                    await asyncio.sleep(10)
-                    continue
-
-                if not response.ok:
-                    logger.error(f"Cannot query user folowers (HTTP {response.status}): {await response.text()}")
-                    raise Exception
-
-                tiktokresponse = TiktokResponse.model_validate(await response.json())
-                data = tiktokresponse.data
-                assert isinstance(data, UserFollowerData)
-
-                for user in data.user_followers:
-                    yield user
+    session = session or await get_session()
+    headers = get_authorization_header(bearer_token)
+    params: Dict = {}
+    body = {"username": username, "max_count": max_count}
+    logger.debug("Query user followers body=%s", body)
 
-                if data.has_more:
-                    body["cursor"] = data.cursor
-                else:
-                    break
+    async for user in paginate(session, QUERY_USER_FOLLOWERS_URL, body, params, headers, data_model=UserFollowerData, items_attr="user_followers", cache=cache):
+        yield user
 
 
-async def query_user_following(bearer_token: str, username: str, max_count: Optional[int] = 100) -> AsyncGenerator[UserFollowerInfoObject, None]:
+async def query_user_following(
+    bearer_token: str, username: str, max_count: Optional[int] = 100, session: Optional[aiohttp.ClientSession] = None, cache: Optional[ResponseCache] = None
+) -> AsyncGenerator[UserFollowerInfoObject, None]:
     """Asynchronously retrieves the users followed by a TikTok user.
 
     This function queries the TikTok API to get a list of users followed by the specified user. It handles rate limiting and pagination of results.
@@ -146,37 +189,22 @@ async def query_user_following(bearer_token: str, username: str, max_count: Opti
         username (str): The username of the TikTok user.
         max_count (Optional[int], optional): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
           than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession], optional): The session used for the requests. Defaults to the shared session.
+        cache (Optional[ResponseCache], optional): A cache for the responses, e.g. a ``diskcache.Cache``. Defaults to no caching.
 
     Yields:
         UserFollowerInfoObject: An object representing each followed user.
 
     Raises:
-        Exception: If an HTTP error occurs or the query fails.
+        TikTokAPIError: If an HTTP error occurs or the query fails.
     """
-    async with aiohttp.ClientSession(headers=get_header(bearer_token)) as session:
-        params: Dict = {}
-        body = {"username": username, "max_count": max_count}
-        logger.debug(f"Query user folowers body={body}")
-
-        while True:
-            async with session.post("https://open.tiktokapis.com/v2/research/user/following/", params=params, json=body) as response:
-                if response.status == 429:
-                    logger.error(f"Too Many Requests (HTTP {response.status}): {await response.text()}")
-                    await asyncio.sleep(10)
-                    continue
-
-                if not response.ok:
-                    logger.error(f"Cannot query user folowers (HTTP {response.status}): {await response.text()}")
-                    raise Exception
-
-                tiktokresponse = TiktokResponse.model_validate(await response.json())
-                data = tiktokresponse.data
-                assert isinstance(data, UserFollowingData)
-
-                for user in data.user_following:
-                    yield user
-
-                if data.has_more:
-                    body["cursor"] = data.cursor
-                else:
-                    break
+    session = session or await get_session()
+    headers = get_authorization_header(bearer_token)
+    params: Dict = {}
+    body = {"username": username, "max_count": max_count}
+    logger.debug("Query user following body=%s", body)
+
+    async for user in paginate(
+        session, QUERY_USER_FOLLOWING_URL, body, params, headers, data_model=UserFollowingData, items_attr="user_following", cache=cache
+    ):
+        yield user
@@ -9,12 +9,12 @@ Examples:
     Retrieve liked videos of a user::
 
         from datetime import datetime
-        from sparta.tiktokapi.access import create_bearer_token
+        from sparta.tiktokapi.access import get_bearer_token
         from sparta.tiktokapi.users.videos import query_user_liked_videos
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await get_bearer_token(client_key, client_secret)
         username = "example_user"
         start_time = datetime(2023, 1, 1)
 
@@ -24,12 +24,12 @@ Examples:
     Retrieve pinned videos of a user::
 
         from datetime import datetime
-        from sparta.tiktokapi.access import create_bearer_token
+        from sparta.tiktokapi.access import get_bearer_token
         from sparta.tiktokapi.users.videos import query_user_pinned_videos
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await get_bearer_token(client_key, client_secret)
         username = "example_user"
         start_time = datetime(2023, 1, 1)
 
@@ -39,34 +39,60 @@ Examples:
     Retrieve reposted videos of a user::
 
         from datetime import datetime
-        from sparta.tiktokapi.access import create_bearer_token
+        from sparta.tiktokapi.access import get_bearer_token
         from sparta.tiktokapi.users.videos import query_user_reposted_videos
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await get_bearer_token(client_key, client_secret)
         username = "example_user"
         start_time = datetime(2023, 1, 1)
 
         async for video in query_user_reposted_videos(bearer_token, username, start_time):
             print(video)
 """
-import asyncio
 import logging
-import time
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import AsyncGenerator, Optional
 
 import aiohttp
 
-from sparta.tiktokapi.access import get_header
+from sparta.tiktokapi.access import get_authorization_header
+from sparta.tiktokapi.cache import PAGE_CACHE_TTL, ResponseCache
 from sparta.tiktokapi.models.constants import USER_VIDEO_FIELDS
-from sparta.tiktokapi.models.model import TiktokResponse, UserLikedVideosData, UserPinnedVideosData, UserRepostedVideosData, VideoObject
+from sparta.tiktokapi.models.model import UserLikedVideosData, UserPinnedVideosData, UserRepostedVideosData, VideoObject
+from sparta.tiktokapi.pagination import paginate
+from sparta.tiktokapi.session import get_session, post_with_retry
 
 logger = logging.getLogger(__name__)
 
+QUERY_USER_LIKED_VIDEOS_URL = "https://open.tiktokapis.com/v2/research/user/liked_videos/"
+QUERY_USER_PINNED_VIDEOS_URL = "https://open.tiktokapis.com/v2/research/user/pinned_videos/"
+QUERY_USER_REPOSTED_VIDEOS_URL = "https://open.tiktokapis.com/v2/research/user/reposted_videos/"
 
-async def query_user_liked_videos(bearer_token: str, username: str, start_time: datetime, max_count: Optional[int] = 100) -> AsyncGenerator[VideoObject, None]:
+
+def to_unix_timestamp(start_time: datetime) -> int:
+    """Converts a datetime into the Unix timestamp in UTC seconds expected as cursor by the TikTok API.
+
+    Args:
+        start_time (datetime): The datetime to convert. A naive datetime is interpreted as UTC.
+
+    Returns:
+        int: The Unix timestamp in seconds.
+    """
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    return int(start_time.timestamp())
+
+
+async def query_user_liked_videos(
+    bearer_token: str,
+    username: str,
+    start_time: datetime,
+    max_count: Optional[int] = 100,
+    session: Optional[aiohttp.ClientSession] = None,
+    cache: Optional[ResponseCache] = None,
+) -> AsyncGenerator[VideoObject, None]:
     """Asynchronously retrieves videos liked by a user.
 
     This function queries the TikTok API to find videos liked by the specified user (https://open.tiktokapis.com/v2/research/user/liked_videos/). It handles
@@ -75,47 +101,38 @@ async def query_user_liked_videos(bearer_token: str, username: str, start_time:
     Args:
         bearer_token (str): The bearer token for authorization.
         username (str): The username of the TikTok user.
-        start_time (datetime): The starting time from which videos are retrieved.
+        start_time (datetime): The starting time from which videos are retrieved. A naive datetime is interpreted as UTC.
         max_count (Optional[int], optional): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
           than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession], optional): The session used for the requests. Defaults to the shared session.
+        cache (Optional[ResponseCache], optional): A cache for the responses, e.g. a ``diskcache.Cache``. Defaults to no caching.
 
     Yields:
         VideoObject: An object representing each liked video.
 
     Raises:
-        Exception: If an HTTP error occurs or the query fails.
+        TikTokAPIError: If an HTTP error occurs or the query fails.
     """
-    async with aiohttp.ClientSession(headers=get_header(bearer_token)) as session:
-        params = {"fields": USER_VIDEO_FIELDS}
-        body = {"username": username, "max_count": max_count, "cursor": time.mktime(start_time.timetuple())}
-        logger.debug(f"Query user liked videos body={body}")
-
-        while True:
-            async with session.post("https://open.tiktokapis.com/v2/research/user/liked_videos/", params=params, json=body) as response:
-                if response.status == 429:
-                    logger.error(f"Too Many Requests (HTTP {response.status}): {await response.text()}")
-                    await asyncio.sleep(10)
-                    continue
-
-                if not response.ok:
-                    logger.error(f"Cannot query videos (HTTP {response.status}): {await response.text()}")
-                    raise Exception
-
-                tiktokresponse = TiktokResponse.model_validate(await response.json())
-                data = tiktokresponse.data
-                assert isinstance(data, UserLikedVideosData)
-
-                for video in data.user_liked_videos:
-                    yield video
-
-                if data.has_more:
-                    body["cursor"] = data.cursor
-                    body["search_id"] = data.search_id
-                else:
-                    break
-
-
-async def query_user_pinned_videos(bearer_token: str, username: str, start_time: datetime, max_count: Optional[int] = 100) -> AsyncGenerator[VideoObject, None]:
+    session = session or await get_session()
+    headers = get_authorization_header(bearer_token)
+    params = {"fields": USER_VIDEO_FIELDS}
+    body = {"username": username, "max_count": max_count, "cursor": to_unix_timestamp(start_time)}
+    logger.debug("Query user liked videos body=%s", body)
+
+    async for video in paginate(
+        session, QUERY_USER_LIKED_VIDEOS_URL, body, params, headers, data_model=UserLikedVideosData, items_attr="user_liked_videos", cache=cache
+    ):
+        yield video
+
+
+async def query_user_pinned_videos(
+    bearer_token: str,
+    username: str,
+    start_time: datetime,
+    max_count: Optional[int] = 100,
+    session: Optional[aiohttp.ClientSession] = None,
+    cache: Optional[ResponseCache] = None,
+) -> AsyncGenerator[VideoObject, None]:
     """Asynchronously retrieves videos pinned by a user.
 
     This function queries the TikTok API to find videos pinned by the specified user (https://open.tiktokapis.com/v2/research/user/pinned_videos/). It handles
@@ -124,37 +141,40 @@ async def query_user_pinned_videos(bearer_token: str, username: str, start_time:
     Args:
         bearer_token (str): The bearer token for authorization.
         username (str): The username of the TikTok user.
-        start_time (datetime): The starting time from which videos are retrieved.
+        start_time (datetime): The starting time from which videos are retrieved. A naive datetime is interpreted as UTC.
         max_count (Optional[int], optional): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
           than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession], optional): The session used for the requests. Defaults to the shared session.
+        cache (Optional[ResponseCache], optional): A cache for the responses, e.g. a ``diskcache.Cache``. Defaults to no caching.
 
     Yields:
         VideoObject: An object representing each pinned video.
 
     Raises:
-        Exception: If an HTTP error occurs or the query fails.
+        TikTokAPIError: If an HTTP error occurs or the query fails.
     """
-    async with aiohttp.ClientSession(headers=get_header(bearer_token)) as session:
-        params = {"fields": USER_VIDEO_FIELDS}
-        body = {"username": username, "max_count": max_count, "cursor": time.mktime(start_time.timetuple())}
-        logger.debug(f"Query user liked videos body={body}")
-
-        async with session.post("https://open.tiktokapis.com/v2/research/user/pinned_videos/", params=params, json=body) as response:
-            if not response.ok:
-                logger.error(f"Cannot query videos (HTTP {response.status}): {await response.text()}")
-                raise Exception
-
-            tiktokresponse = TiktokResponse.model_validate(await response.json())
+    session = session or await get_session()
+    headers = get_authorization_header(bearer_token)
+    params = {"fields": USER_VIDEO_FIELDS}
+    body = {"username": username, "max_count": max_count, "cursor": to_unix_timestamp(start_time)}
+    logger.debug("Query user pinned videos body=%s", body)
 
-            data = tiktokresponse.data
-            assert isinstance(data, UserPinnedVideosData)
+    response_json = await post_with_retry(
+        session, QUERY_USER_PINNED_VIDEOS_URL, cache=cache, cache_ttl=PAGE_CACHE_TTL, params=params, json=body, headers=headers
+    )
+    data = UserPinnedVideosData.model_validate(response_json["data"])
 
-            for video in data.pinned_videos_list:
-                yield video
+    for video in data.pinned_videos_list:
+        yield video
 
 
 async def query_user_reposted_videos(
-    bearer_token: str, username: str, start_time: datetime, max_count: Optional[int] = 100
+    bearer_token: str,
+    username: str,
+    start_time: datetime,
+    max_count: Optional[int] = 100,
+    session: Optional[aiohttp.ClientSession] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> AsyncGenerator[VideoObject, None]:
     """Asynchronously retrieves videos reposted by a user.
 
@@ -164,41 +184,25 @@ async def query_user_reposted_videos(
     Args:
         bearer_token (str): The bearer token for authorization.
         username (str): The username of the TikTok user.
-        start_time (datetime): The starting time from which videos are retrieved.
+        start_time (datetime): The starting time from which videos are retrieved. A naive datetime is interpreted as UTC.
         max_count (Optional[int], optional): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
           than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession], optional): The session used for the requests. Defaults to the shared session.
+        cache (Optional[ResponseCache], optional): A cache for the responses, e.g. a ``diskcache.Cache``. Defaults to no caching.
 
     Yields:
         VideoObject: An object representing each reposted video.
 
     Raises:
-        Exception: If an HTTP error occurs or the query fails.
+        TikTokAPIError: If an HTTP error occurs or the query fails.
     """
-    async with aiohttp.ClientSession(headers=get_header(bearer_token)) as session:
-        params = {"fields": USER_VIDEO_FIELDS}
-        body = {"username": username, "max_count": max_count, "cursor": time.mktime(start_time.timetuple())}
-        logger.debug(f"Query user liked videos body={body}")
-
-        while True:
-            async with session.post("https://open.tiktokapis.com/v2/research/user/reposted_videos/", params=params, json=body) as response:
-                if response.status == 429:
-                    logger.error(f"Too Many Requests (HTTP {response.status}): {await response.text()}")
-                    await asyncio.sleep(10)
-                    continue
-
-                if not response.ok:
-                    logger.error(f"Cannot query videos (HTTP {response.status}): {await response.text()}")
-                    raise Exception
-
-                tiktokresponse = TiktokResponse.model_validate(await response.json())
-                data = tiktokresponse.data
-                assert isinstance(data, UserRepostedVideosData)
-
-                for video in data.user_reposted_videos:
-                    yield video
-
-                if data.has_more:
-                    body["cursor"] = data.cursor
-                    body["search_id"] = data.search_id
-                else:
-                    break
+    session = session or await get_session()
+    headers = get_authorization_header(bearer_token)
+    params = {"fields": USER_VIDEO_FIELDS}
+    body = {"username": username, "max_count": max_count, "cursor": to_unix_timestamp(start_time)}
+    logger.debug("Query user reposted videos body=%s", body)
+
+    async for video in paginate(
+        session, QUERY_USER_REPOSTED_VIDEOS_URL, body, params, headers, data_model=UserRepostedVideosData, items_attr="user_reposted_videos", cache=cache
+    ):
+        yield video
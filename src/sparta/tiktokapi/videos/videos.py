@@ -9,12 +9,12 @@ Examples:
     Asynchronously query videos::
 
         from datetime import date
-        from sparta.tiktokapi.access import create_bearer_token
+        from sparta.tiktokapi.access import get_bearer_token
         from tiktok_video_queries import query_videos
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await get_bearer_token(client_key, client_secret)
         query = {"and": [{"field": "title", "value": "example"}]}
         start_date = date(2023, 1, 1)
         end_date = date(2023, 1, 31)
@@ -24,12 +24,12 @@ Examples:
 
     Asynchronously query video comments::
 
-        from sparta.tiktokapi.access import create_bearer_token
+        from sparta.tiktokapi.access import get_bearer_token
         from tiktok_video_queries import query_video_comments
 
         client_key = "your_client_key"
         client_secret = "your_client_secret"
-        bearer_token = create_bearer_token(client_key, client_secret)
+        bearer_token = await get_bearer_token(client_key, client_secret)
         video_id = 1234567890
 
         async for comment in query_video_comments(bearer_token, video_id):
@@ -37,17 +37,173 @@ Examples:
 """
 import asyncio
 import logging
+from contextlib import aclosing
 from datetime import date
-from typing import AsyncGenerator, Dict, Optional
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import aiohttp
+import orjson
 
-from sparta.tiktokapi.access import get_header
+from sparta.tiktokapi.access import get_authorization_header
+from sparta.tiktokapi.cache import ResponseCache
+from sparta.tiktokapi.exceptions import TikTokAPIError
 from sparta.tiktokapi.models.constants import VIDEO_COMMENT_FIELS, VIDEO_FIELDS
-from sparta.tiktokapi.models.model import CommentObject, Error, QueryVideoResponseData, ResearchVideoCommentsData, TiktokResponse, VideoObject
+from sparta.tiktokapi.models.model import CommentObject, QueryVideoResponseData, ResearchVideoCommentsData, VideoObject
+from sparta.tiktokapi.pagination import paginate_pages
+from sparta.tiktokapi.ratelimit import MAX_RPS, get_rate_limiter
+from sparta.tiktokapi.session import get_session
 
 logger = logging.getLogger(__name__)
 
+QUERY_VIDEOS_URL = "https://open.tiktokapis.com/v2/research/video/query/"
+QUERY_VIDEO_COMMENTS_URL = "https://open.tiktokapis.com/v2/research/video/comment/list/"
+MAX_RETRY_DURATION = 60 * 60
+QUERY_TIMEOUT = aiohttp.ClientTimeout(total=300, connect=10)
+
+
+def is_expired_search_id(error: TikTokAPIError) -> bool:
+    """Checks whether a query failed because the TikTok API does not recognise its search ID (yet).
+
+    Args:
+        error (TikTokAPIError): The error of the failed query.
+
+    Returns:
+        bool: True if the error message reports an invalid or expired search ID.
+    """
+    # Check the raw body first, so that other errors are not parsed at all.
+    if error.status != 400 or "is invalid or expired" not in error.body:
+        return False
+    try:
+        response_json = orjson.loads(error.body)
+    except orjson.JSONDecodeError:
+        return False
+    error_json = response_json.get("error") if isinstance(response_json, dict) else None
+    message = error_json.get("message") if isinstance(error_json, dict) else None
+    return isinstance(message, str) and "is invalid or expired" in message
+
+
+def _renew_expired_search_id() -> Callable[[TikTokAPIError, Dict], bool]:
+    """Creates the ``retry_on`` callback of :func:`~sparta.tiktokapi.pagination.paginate_pages` for queries whose search ID is invalid or expired.
+
+    The TikTok API may not recognise a search ID that is used immediately after it was returned, so a page is first requested again with the same search ID.
+    Only if that fails too, the search ID is removed from the body to let the TikTok API start a new search. The cursor is kept to continue at the same
+    position instead of yielding the videos of the previous pages again.
+
+    Returns:
+        Callable[[TikTokAPIError, Dict], bool]: The callback, which returns True if the query should be retried.
+    """
+    retried: Optional[Tuple[Optional[int], Optional[str]]] = None
+
+    def renew_expired_search_id(error: TikTokAPIError, body: Dict) -> bool:
+        nonlocal retried
+        if not is_expired_search_id(error):
+            return False
+        page = (body.get("cursor"), body.get("search_id"))
+        if page != retried:
+            retried = page
+        else:
+            body.pop("search_id", None)
+        return True
+
+    return renew_expired_search_id
+
+
+def _checkpoint_next_page(checkpoint: Callable[[int, str], Awaitable[None]]) -> Callable[[Dict], Awaitable[None]]:
+    """Adapts a checkpoint callback of :func:`query_videos_pages` to the fields of the next page passed by
+    :func:`~sparta.tiktokapi.pagination.paginate_pages`.
+    """
+
+    async def save_checkpoint(next_page: Dict) -> None:
+        await checkpoint(next_page["cursor"], next_page["search_id"])
+
+    return save_checkpoint
+
+
+async def query_videos_pages(
+    bearer_token: str,
+    query: Dict,
+    start_date: date,
+    end_date: date,
+    is_random: Optional[bool] = None,
+    max_count: Optional[int] = 100,
+    session: Optional[aiohttp.ClientSession] = None,
+    max_rps: Optional[float] = MAX_RPS,
+    resume_cursor: Optional[int] = None,
+    resume_search_id: Optional[str] = None,
+    checkpoint: Optional[Callable[[int, str], Awaitable[None]]] = None,
+    cache: Optional[ResponseCache] = None,
+) -> AsyncGenerator[List[VideoObject], None]:
+    """Asynchronously retrieves the pages of videos matching a specific query.
+
+    This function queries the TikTok API to find videos matching the given search criteria (https://developers.tiktok.com/doc/research-api-specs-query-videos/).
+    It handles rate limiting and pagination of results, requesting the next page while the current one is processed. The following pages are requested
+    with the cursor and search ID only. If the TikTok API rejects that, the whole query is sent instead, for this and all later queries of the process until
+    :func:`~sparta.tiktokapi.pagination.clear_full_body_urls` is called.
+
+    Args:
+        bearer_token (str): The bearer token for authentication.
+        query (Dict): A JSON object that contains three types of children: and, or, and not, each of which is a list of conditions. A valid query must contain
+                      at least one non-empty and, or, or not condition lists.
+        start_date (date): The lower bound of video creation time in UTC.
+        end_date (date): The upper bound of video creation time in UTC. The end_date must be no more than 30 days after the start_date.
+        is_random (Optional[bool]): The flag that indicates whether to return results in random order.  If set to true, the API will return 1-100 videos in a
+            random order that matches the query. If set to false or not set, then the API returns results in descending order of video IDs.
+        max_count (Optional[int]): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
+          than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession]): The session used for the requests. Defaults to the shared session.
+        max_rps (Optional[float]): The maximum number of requests per second, shared by all queries with the same bearer token, or None to disable
+          pacing. Only the value of the first query with the bearer token applies, see :func:`~sparta.tiktokapi.ratelimit.get_rate_limiter`. Defaults to
+          :data:`~sparta.tiktokapi.ratelimit.MAX_RPS`.
+        resume_cursor (Optional[int]): The cursor of a checkpoint to resume an interrupted query from. Defaults to starting at the first video.
+        resume_search_id (Optional[str]): The search ID of a checkpoint to resume an interrupted query from. Defaults to starting a new search.
+        checkpoint (Optional[Callable[[int, str], Awaitable[None]]]): Called with the cursor and the search ID of the next page, once a page that is
+          followed by another one has been processed. Persist them to resume the query in case it is interrupted. Defaults to None.
+        cache (Optional[ResponseCache]): A cache for the responses, e.g. a ``diskcache.Cache`` or a :class:`~sparta.tiktokapi.cache.MemoryCache`.
+          Defaults to no caching.
+
+    Yields:
+        List[VideoObject]: The videos of each page.
+
+    Raises:
+        TikTokAPIError: If an HTTP error occurs or the query fails. Rate limits and server errors are retried with exponential backoff for up to
+          :data:`MAX_RETRY_DURATION` seconds. A page whose search ID is invalid or expired is requested again, first with the same search ID and then
+          with a new search, up to :data:`~sparta.tiktokapi.pagination.MAX_PAGE_RETRIES` times.
+    """
+    session = session or await get_session()
+    headers = get_authorization_header(bearer_token)
+    rate_limiter = get_rate_limiter(bearer_token, max_rps) if max_rps else None
+    params = {"fields": VIDEO_FIELDS}
+
+    body = {"query": query, "start_date": start_date.strftime("%Y%m%d"), "end_date": end_date.strftime("%Y%m%d"), "max_count": max_count}
+    if is_random:
+        body["is_random"] = is_random
+    if resume_cursor is not None:
+        body["cursor"] = resume_cursor
+    if resume_search_id is not None:
+        body["search_id"] = resume_search_id
+
+    logger.debug("Query video body=%s", body)
+    pages = paginate_pages(
+        session,
+        QUERY_VIDEOS_URL,
+        body,
+        params,
+        headers,
+        QueryVideoResponseData,
+        "videos",
+        retry_on=_renew_expired_search_id(),
+        continuation=("max_count",),
+        checkpoint=_checkpoint_next_page(checkpoint) if checkpoint is not None else None,
+        cache=cache,
+        rate_limiter=rate_limiter,
+        max_attempts=None,
+        max_duration=MAX_RETRY_DURATION,
+        timeout=QUERY_TIMEOUT,
+    )
+    async with aclosing(pages):
+        async for videos in pages:
+            yield videos
+
 
 async def query_videos(
     bearer_token: str,
@@ -56,11 +212,19 @@ async def query_videos(
     end_date: date,
     is_random: Optional[bool] = None,
     max_count: Optional[int] = 100,
+    session: Optional[aiohttp.ClientSession] = None,
+    max_rps: Optional[float] = MAX_RPS,
+    resume_cursor: Optional[int] = None,
+    resume_search_id: Optional[str] = None,
+    checkpoint: Optional[Callable[[int, str], Awaitable[None]]] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> AsyncGenerator[VideoObject, None]:
     """Asynchronously retrieves videos based on a specific query.
 
     This function queries the TikTok API to find videos matching the given search criteria (https://developers.tiktok.com/doc/research-api-specs-query-videos/).
-    It handles rate limiting and pagination of results.
+    It handles rate limiting and pagination of results, requesting the next page while the current one is processed. The following pages are requested
+    with the cursor and search ID only. If the TikTok API rejects that, the whole query is sent instead, for this and all later queries of the process until
+    :func:`~sparta.tiktokapi.pagination.clear_full_body_urls` is called. Use :func:`query_videos_pages` to process the videos page by page.
 
     Args:
         bearer_token (str): The bearer token for authentication.
@@ -72,115 +236,211 @@ async def query_videos(
             random order that matches the query. If set to false or not set, then the API returns results in descending order of video IDs.
         max_count (Optional[int]): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
           than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession]): The session used for the requests. Defaults to the shared session.
+        max_rps (Optional[float]): The maximum number of requests per second, shared by all queries with the same bearer token, or None to disable
+          pacing. Only the value of the first query with the bearer token applies, see :func:`~sparta.tiktokapi.ratelimit.get_rate_limiter`. Defaults to
+          :data:`~sparta.tiktokapi.ratelimit.MAX_RPS`.
+        resume_cursor (Optional[int]): The cursor of a checkpoint to resume an interrupted query from. Defaults to starting at the first video.
+        resume_search_id (Optional[str]): The search ID of a checkpoint to resume an interrupted query from. Defaults to starting a new search.
+        checkpoint (Optional[Callable[[int, str], Awaitable[None]]]): Called with the cursor and the search ID of the next page, once a page that is
+          followed by another one has been processed. Persist them to resume the query in case it is interrupted. Defaults to None.
+        cache (Optional[ResponseCache]): A cache for the responses, e.g. a ``diskcache.Cache`` or a :class:`~sparta.tiktokapi.cache.MemoryCache`.
+          Defaults to no caching.
 
     Yields:
         VideoObject: An object representing each video.
 
     Raises:
-        Exception: If an HTTP error occurs or the query fails.
+        TikTokAPIError: If an HTTP error occurs or the query fails. Rate limits and server errors are retried with exponential backoff for up to
+          :data:`MAX_RETRY_DURATION` seconds. A page whose search ID is invalid or expired is requested again, first with the same search ID and then
+          with a new search, up to :data:`~sparta.tiktokapi.pagination.MAX_PAGE_RETRIES` times.
+    """
+    async with aclosing(
+        query_videos_pages(
+            bearer_token, query, start_date, end_date, is_random, max_count, session, max_rps, resume_cursor, resume_search_id, checkpoint, cache
+        )
+    ) as pages:
+        async for videos in pages:
+            for video in videos:
+                yield video
+
+
+async def query_videos_many(
+    bearer_token: str,
+    queries: List[Dict],
+    start_date: date,
+    end_date: date,
+    is_random: Optional[bool] = None,
+    max_count: Optional[int] = 100,
+    concurrency: int = 4,
+    session: Optional[aiohttp.ClientSession] = None,
+    max_rps: Optional[float] = MAX_RPS,
+    cache: Optional[ResponseCache] = None,
+) -> AsyncGenerator[Tuple[Dict, VideoObject], None]:
+    """Asynchronously retrieves the videos of many queries in parallel.
+
+    This function runs :func:`query_videos_pages` for up to ``concurrency`` queries at once and yields their videos as their pages arrive. All queries share
+    the rate limit of the bearer token, so a higher concurrency overlaps the latency of the requests but does not exceed ``max_rps``. If a query fails, the
+    other queries are cancelled and its exception is raised. Likewise, closing the generator early cancels all queries.
+
+    Args:
+        bearer_token (str): The bearer token for authentication.
+        queries (List[Dict]): The queries, see :func:`query_videos`.
+        start_date (date): The lower bound of video creation time in UTC.
+        end_date (date): The upper bound of video creation time in UTC. The end_date must be no more than 30 days after the start_date.
+        is_random (Optional[bool]): The flag that indicates whether to return results in random order, see :func:`query_videos`.
+        max_count (Optional[int]): The maximum number of videos to retrieve per page. Default and max is 100.
+        concurrency (int, optional): The maximum number of parallel queries. Defaults to 4.
+        session (Optional[aiohttp.ClientSession]): The session used for the requests. Defaults to the shared session.
+        max_rps (Optional[float]): The maximum number of requests per second, shared by all queries with the same bearer token, or None to disable
+          pacing. Only the value of the first query with the bearer token applies, see :func:`~sparta.tiktokapi.ratelimit.get_rate_limiter`. Defaults to
+          :data:`~sparta.tiktokapi.ratelimit.MAX_RPS`.
+        cache (Optional[ResponseCache]): A cache for the responses, e.g. a ``diskcache.Cache`` or a :class:`~sparta.tiktokapi.cache.MemoryCache`.
+          Defaults to no caching.
+
+    Yields:
+        Tuple[Dict, VideoObject]: The query and each of its videos, interleaved across the queries.
+
+    Raises:
+        ValueError: If ``concurrency`` is less than 1.
+        TikTokAPIError: If an HTTP error occurs or a query fails, see :func:`query_videos`.
     """
-    gateway_timeout_counter = 0
-    async with aiohttp.ClientSession(headers=get_header(bearer_token)) as session:
-        params = {"fields": VIDEO_FIELDS}
-
-        body = {"query": query, "start_date": start_date.strftime("%Y%m%d"), "end_date": end_date.strftime("%Y%m%d"), "max_count": max_count}
-        if is_random:
-            body["is_random"] = is_random
-
-        logger.debug(f"Query video body={body}")
-        while True:
-            async with session.post("https://open.tiktokapis.com/v2/research/video/query/", params=params, json=body) as response:
-                if response.status == 429:
-                    logger.error(f"Too Many Requests (HTTP {response.status}): {await response.text()}")
-                    await asyncio.sleep(10)
-                    continue
-
-                if response.status == 504:
-                    logger.error(f"Gateway Timeout (HTTP {response.status})")
-                    gateway_timeout_counter += 1
-                    if gateway_timeout_counter >= 10:
-                        logger.error(f"Gateway Timeout (HTTP {response.status}): {await response.text()}")
-                        logger.error("Abort the loop as Gateway has not responded for 1 hour.")
-                        raise Exception(f"Gateway Timeout (HTTP {response.status}): {await response.text()}")
-                    await asyncio.sleep(600)
-                    continue
-
-                if response.status == 500:
-                    continue
-
-                response_json = await response.json()
-
-                if not response.ok:
-                    logger.warn(f"Cannot query videos (HTTP {response.status}): {await response.text()}")
-                    if response.status == 400:
-                        error = Error.model_validate(response_json.get("error"))
-                        if "is invalid or expired" in error.message:
-                            logger.info("Sleep for 10 seconds as the TikTok API will not recognise the search ID if you use it immediately.")
-                            await asyncio.sleep(10)
-                            continue
-                    else:
-                        raise Exception(f"Cannot query videos (HTTP {response.status}): {response.text}")
-
-                tiktokresponse = TiktokResponse.model_validate(response_json)
-                data = tiktokresponse.data
-                if not (isinstance(data, QueryVideoResponseData)):
-                    break
-
-                for video in data.videos:
-                    yield video
-
-                if data.has_more:
-                    body["cursor"] = data.cursor
-                    body["search_id"] = data.search_id
-                else:
-                    break
-
-
-async def query_video_comments(bearer_token: str, video_id: int, max_count: Optional[int] = 100) -> AsyncGenerator[CommentObject, None]:
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, not {concurrency}")
+    session = session or await get_session()
+    semaphore = asyncio.Semaphore(concurrency)
+    pages: asyncio.Queue[Union[Tuple[Dict, List[VideoObject]], BaseException, None]] = asyncio.Queue(maxsize=concurrency)
+
+    async def bounded_query_videos(query: Dict) -> None:
+        try:
+            async with semaphore:
+                async with aclosing(
+                    query_videos_pages(bearer_token, query, start_date, end_date, is_random, max_count, session, max_rps, cache=cache)
+                ) as query_pages:
+                    async for videos in query_pages:
+                        await pages.put((query, videos))
+        except Exception as error:
+            await pages.put(error)
+        else:
+            await pages.put(None)
+
+    tasks = [asyncio.create_task(bounded_query_videos(query)) for query in queries]
+    try:
+        running = len(tasks)
+        while running:
+            page = await pages.get()
+            if page is None:
+                running -= 1
+                continue
+            if isinstance(page, BaseException):
+                raise page
+
+            query, videos = page
+            for video in videos:
+                yield query, video
+    finally:
+        # Wait for the cancelled queries, so that none of them is left blocked on the queue once the caller stops or a query fails.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def query_video_comments_pages(
+    bearer_token: str,
+    video_id: int,
+    max_count: Optional[int] = 100,
+    session: Optional[aiohttp.ClientSession] = None,
+    max_rps: Optional[float] = MAX_RPS,
+    cache: Optional[ResponseCache] = None,
+) -> AsyncGenerator[List[CommentObject], None]:
+    """Asynchronously retrieves the pages of comments for a specific video.
+
+    This function queries the TikTok API to find comments on the specified video (https://developers.tiktok.com/doc/research-api-specs-query-video-comments/).
+    It handles rate limiting and pagination of results, requesting the next page while the current one is processed.
+
+    Args:
+        bearer_token (str): The bearer token for authentication.
+        video_id (int): The ID of the video to retrieve comments for.
+        max_count (Optional[int]): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
+          than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession]): The session used for the requests. Defaults to the shared session.
+        max_rps (Optional[float]): The maximum number of requests per second, shared by all queries with the same bearer token, or None to disable
+          pacing. Only the value of the first query with the bearer token applies, see :func:`~sparta.tiktokapi.ratelimit.get_rate_limiter`. Defaults to
+          :data:`~sparta.tiktokapi.ratelimit.MAX_RPS`.
+        cache (Optional[ResponseCache]): A cache for the responses, e.g. a ``diskcache.Cache`` or a :class:`~sparta.tiktokapi.cache.MemoryCache`.
+          Defaults to no caching.
+
+    Yields:
+        List[CommentObject]: The comments of each page.
+
+    Raises:
+        TikTokAPIError: If an HTTP error occurs or the query fails. Rate limits and server errors are retried with exponential backoff for up to
+          :data:`MAX_RETRY_DURATION` seconds.
+
+    Note: only the top 1000 comments will be returned, so cursor + max_count <= 1000.
+    """
+    session = session or await get_session()
+    headers = get_authorization_header(bearer_token)
+    rate_limiter = get_rate_limiter(bearer_token, max_rps) if max_rps else None
+    params = {"fields": VIDEO_COMMENT_FIELS}
+    body = {"video_id": video_id, "max_count": max_count}
+
+    logger.debug("Query video comments body=%s", body)
+    pages = paginate_pages(
+        session,
+        QUERY_VIDEO_COMMENTS_URL,
+        body,
+        params,
+        headers,
+        ResearchVideoCommentsData,
+        "comments",
+        cache=cache,
+        rate_limiter=rate_limiter,
+        max_attempts=None,
+        max_duration=MAX_RETRY_DURATION,
+        timeout=QUERY_TIMEOUT,
+    )
+    async with aclosing(pages):
+        async for comments in pages:
+            yield comments
+
+
+async def query_video_comments(
+    bearer_token: str,
+    video_id: int,
+    max_count: Optional[int] = 100,
+    session: Optional[aiohttp.ClientSession] = None,
+    max_rps: Optional[float] = MAX_RPS,
+    cache: Optional[ResponseCache] = None,
+) -> AsyncGenerator[CommentObject, None]:
     """Asynchronously retrieves comments for a specific video.
 
     This function queries the TikTok API to find comments on the specified video (https://developers.tiktok.com/doc/research-api-specs-query-video-comments/).
-    It handles rate limiting and pagination of results.
+    It handles rate limiting and pagination of results, requesting the next page while the current one is processed. Use
+    :func:`query_video_comments_pages` to process the comments page by page.
 
     Args:
         bearer_token (str): The bearer token for authentication.
         video_id (int): The ID of the video to retrieve comments for.
         max_count (Optional[int]): The maximum number of videos to retrieve. Default and max is 100. It is possible that the API returns fewer videos
           than the max count due to content moderation outcomes, videos being deleted, marked as private by users, or more.
+        session (Optional[aiohttp.ClientSession]): The session used for the requests. Defaults to the shared session.
+        max_rps (Optional[float]): The maximum number of requests per second, shared by all queries with the same bearer token, or None to disable
+          pacing. Only the value of the first query with the bearer token applies, see :func:`~sparta.tiktokapi.ratelimit.get_rate_limiter`. Defaults to
+          :data:`~sparta.tiktokapi.ratelimit.MAX_RPS`.
+        cache (Optional[ResponseCache]): A cache for the responses, e.g. a ``diskcache.Cache`` or a :class:`~sparta.tiktokapi.cache.MemoryCache`.
+          Defaults to no caching.
 
     Yields:
         CommentObject: An object representing each comment.
 
     Raises:
-        Exception: If an HTTP error occurs or the query fails.
+        TikTokAPIError: If an HTTP error occurs or the query fails. Rate limits and server errors are retried with exponential backoff for up to
+          :data:`MAX_RETRY_DURATION` seconds.
 
     Note: only the top 1000 comments will be returned, so cursor + max_count <= 1000.
     """
-    async with aiohttp.ClientSession(headers=get_header(bearer_token)) as session:
-        params = {"fields": VIDEO_COMMENT_FIELS}
-        body = {"video_id": video_id, "max_count": max_count}
-
-        logger.debug(f"Query video comments body={body}")
-        while True:
-            async with session.post("https://open.tiktokapis.com/v2/research/video/comment/list/", params=params, json=body) as response:
-                if response.status == 429:
-                    logger.error(f"Too Many Requests (HTTP {response.status}): {await response.text()}")
-                    await asyncio.sleep(10)
-                    continue
-
-                if not response.ok:
-                    logger.error(f"Cannot query videos (HTTP {response.status}): {await response.text()}")
-                    raise Exception
-
-                tiktokresponse = TiktokResponse.model_validate(await response.json())
-                data = tiktokresponse.data
-                assert isinstance(data, ResearchVideoCommentsData)
-
-                for comment in data.comments:
-                    yield comment
-
-                if data.has_more:
-                    body["cursor"] = data.cursor
-                    body["search_id"] = data.search_id  # type: ignore
-                else:
-                    break
+    async with aclosing(query_video_comments_pages(bearer_token, video_id, max_count, session, max_rps, cache)) as pages:
+        async for comments in pages:
+            for comment in comments:
+                yield comment
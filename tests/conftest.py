@@ -0,0 +1,53 @@
+import os
+from types import ModuleType, SimpleNamespace
+from typing import AsyncGenerator, List
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from sparta.tiktokapi.access import get_bearer_token
+from sparta.tiktokapi.session import close_session, create_session
+
+client_key = os.getenv("CLIENT_KEY", "")
+client_secret = os.getenv("CLIENT_SECRET", "")
+
+
+@pytest_asyncio.fixture
+async def bearer_token() -> AsyncGenerator[str, None]:
+    # The token and the queries of the test use the shared session of the test's event loop, so close it before the loop goes away.
+    try:
+        yield await get_bearer_token(client_key, client_secret)
+    finally:
+        await close_session()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def session() -> AsyncGenerator[aiohttp.ClientSession, None]:
+    async with create_session() as session:
+        yield session
+
+
+class Clock:
+    """Replaces time.monotonic and asyncio.sleep of the modules under test, sleeping only records the delay."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.monkeypatch = monkeypatch
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+
+    def patch(self, module: ModuleType, sleep: bool = False) -> None:
+        self.monkeypatch.setattr(module, "time", SimpleNamespace(monotonic=self.monotonic))
+        if sleep:
+            self.monkeypatch.setattr(module, "asyncio", SimpleNamespace(sleep=self.sleep))
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    return Clock(monkeypatch)
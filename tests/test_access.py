@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+import sparta.tiktokapi.access
+from sparta.tiktokapi.access import TOKEN_EXPIRY_SKEW, get_bearer_token
+from tests.conftest import Clock
+
+
+class FakeTokenRequest:
+    """Answers each token request with a new bearer token that expires in an hour."""
+
+    def __init__(self) -> None:
+        self.requests: List[str] = []
+
+    async def __call__(self, client_key: str, client_secret: str, session: Any) -> Dict:
+        self.requests.append(client_key)
+        await asyncio.sleep(0)
+        return {"access_token": f"token {len(self.requests)}", "expires_in": 3600}
+
+
+@pytest.fixture
+def token_request(monkeypatch: pytest.MonkeyPatch, clock: Clock) -> FakeTokenRequest:
+    clock.patch(sparta.tiktokapi.access)
+    token_request = FakeTokenRequest()
+    monkeypatch.setattr(sparta.tiktokapi.access, "_request_bearer_token", token_request)
+    monkeypatch.setattr(sparta.tiktokapi.access, "_bearer_tokens", {})
+    return token_request
+
+
+@pytest.mark.asyncio
+async def test_get_bearer_token_returns_cached_token(token_request: FakeTokenRequest, clock: Clock) -> None:
+    assert await get_bearer_token("key", "secret") == "token 1"
+    clock.now += 3600 - TOKEN_EXPIRY_SKEW - 1
+    assert await get_bearer_token("key", "secret") == "token 1"
+    assert await get_bearer_token("other key", "secret") == "token 2"
+    assert token_request.requests == ["key", "other key"]
+
+
+@pytest.mark.asyncio
+async def test_get_bearer_token_refreshes_token_before_expiry(token_request: FakeTokenRequest, clock: Clock) -> None:
+    assert await get_bearer_token("key", "secret") == "token 1"
+    clock.now += 3600 - TOKEN_EXPIRY_SKEW
+    assert await get_bearer_token("key", "secret") == "token 2"
+    assert token_request.requests == ["key", "key"]
+
+
+@pytest.mark.asyncio
+async def test_get_bearer_token_shares_request_of_concurrent_callers(token_request: FakeTokenRequest) -> None:
+    assert await asyncio.gather(*[get_bearer_token("key", "secret") for _ in range(3)]) == ["token 1"] * 3
+    assert token_request.requests == ["key"]
+
+
+def test_get_bearer_token_in_several_event_loops(token_request: FakeTokenRequest, clock: Clock) -> None:
+    async def get_bearer_tokens() -> List[str]:
+        clock.now += 3600
+        return await asyncio.gather(*[get_bearer_token("key", "secret") for _ in range(2)])
+
+    assert asyncio.run(get_bearer_tokens()) == ["token 1"] * 2
+    assert asyncio.run(get_bearer_tokens()) == ["token 2"] * 2
@@ -0,0 +1,38 @@
+import pytest
+
+import sparta.tiktokapi.cache
+from sparta.tiktokapi.cache import MemoryCache, cache_key
+from tests.conftest import Clock
+
+
+@pytest.fixture
+def clock(clock: Clock) -> Clock:
+    clock.patch(sparta.tiktokapi.cache)
+    return clock
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_memory_cache_expires_entries(clock: Clock) -> None:
+    cache = MemoryCache()
+    cache.set("a", 1, expire=10)
+    cache.set("b", 2)
+    clock.now += 9
+    assert cache.get("a") == 1
+    clock.now += 1
+    assert cache.get("a", "expired") == "expired"
+    assert cache.get("b") == 2
+
+
+def test_cache_key_ignores_key_order() -> None:
+    assert cache_key("url", {"a": 1, "b": 2}, {"c": 3, "d": 4}) == cache_key("url", {"b": 2, "a": 1}, {"d": 4, "c": 3})
+    assert cache_key("url", {"a": 1}, {"c": 3}) != cache_key("url", {"a": 1}, {"c": 4})
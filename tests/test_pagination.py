@@ -0,0 +1,184 @@
+import asyncio
+from contextlib import aclosing
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+
+import aiohttp
+import pytest
+from pydantic import BaseModel
+
+import sparta.tiktokapi.pagination
+from sparta.tiktokapi.exceptions import TikTokAPIError
+from sparta.tiktokapi.pagination import MAX_PAGE_RETRIES, clear_full_body_urls, paginate
+from sparta.tiktokapi.videos.videos import QUERY_VIDEOS_URL, _renew_expired_search_id, query_videos_pages
+
+URL = "https://example.com/"
+EXPIRED_SEARCH_ID_BODY = '{"error": {"code": "invalid_params", "message": "Search Id 7 is invalid or expired", "log_id": "1"}}'
+
+
+class Page(BaseModel):
+    items: List[int]
+    cursor: int
+    search_id: Optional[str] = None
+    has_more: bool
+
+
+def page(items: List[int], cursor: int, has_more: bool = True) -> Dict:
+    return {"data": {"items": items, "cursor": cursor, "search_id": "1", "has_more": has_more}}
+
+
+def video_page(cursor: int, has_more: bool = True) -> Dict:
+    video = {
+        "id": cursor,
+        "create_time": 0,
+        "username": "user",
+        "region_code": "US",
+        "video_description": "",
+        "comment_count": 0,
+        "share_count": 0,
+        "view_count": 0,
+        "hashtag_names": [],
+    }
+    return {"data": {"videos": [video], "cursor": cursor, "has_more": has_more, "search_id": "7"}}
+
+
+class FakePost:
+    """Answers each request with the next response, raising it if it is an exception, and records the bodies sent."""
+
+    def __init__(self, responses: List[Any]) -> None:
+        self.responses = responses
+        self.bodies: List[Dict] = []
+
+    async def __call__(self, session: aiohttp.ClientSession, url: str, json: Dict, **kwargs: Any) -> Dict:
+        self.bodies.append(dict(json))
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return cast(Dict, response)
+
+
+@pytest.fixture
+def full_body_urls(monkeypatch: pytest.MonkeyPatch) -> Set[str]:
+    urls: Set[str] = set()
+    monkeypatch.setattr(sparta.tiktokapi.pagination, "_full_body_urls", urls)
+    monkeypatch.setattr(sparta.tiktokapi.pagination, "retry_delay", lambda response, attempt: 0.0)
+    return urls
+
+
+def fake_post(monkeypatch: pytest.MonkeyPatch, responses: List[Any]) -> FakePost:
+    post = FakePost(responses)
+    monkeypatch.setattr(sparta.tiktokapi.pagination, "post_with_retry", post)
+    return post
+
+
+def bad_request() -> TikTokAPIError:
+    return TikTokAPIError(400, '{"error": {"code": "invalid_params"}}', URL)
+
+
+def expired_search_id() -> TikTokAPIError:
+    return TikTokAPIError(400, EXPIRED_SEARCH_ID_BODY, QUERY_VIDEOS_URL)
+
+
+async def query(**kwargs: Any) -> List[int]:
+    body = {"query": {"and": []}, "max_count": 2}
+    session = cast(aiohttp.ClientSession, None)
+    return [item async for item in paginate(session, URL, body, {}, {}, Page, "items", continuation=("max_count",), **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_paginate_sends_reduced_body(monkeypatch: pytest.MonkeyPatch, full_body_urls: Set[str]) -> None:
+    post = fake_post(monkeypatch, [page([1, 2], 2), page([3], 3, has_more=False)])
+    assert await query() == [1, 2, 3]
+    assert post.bodies == [{"query": {"and": []}, "max_count": 2}, {"max_count": 2, "cursor": 2, "search_id": "1"}]
+    assert not full_body_urls
+
+
+@pytest.mark.asyncio
+async def test_paginate_falls_back_to_whole_body(monkeypatch: pytest.MonkeyPatch, full_body_urls: Set[str]) -> None:
+    post = fake_post(monkeypatch, [page([1], 1), bad_request(), page([2], 2), page([3], 3, has_more=False)])
+    assert await query() == [1, 2, 3]
+    whole_body = {"query": {"and": []}, "max_count": 2, "cursor": 1, "search_id": "1"}
+    assert post.bodies[1] == {"max_count": 2, "cursor": 1, "search_id": "1"}
+    assert post.bodies[2] == whole_body
+    assert post.bodies[3] == {**whole_body, "cursor": 2}
+    assert full_body_urls == {URL}
+
+    post = fake_post(monkeypatch, [page([1], 1), page([2], 2, has_more=False)])
+    assert await query() == [1, 2]
+    assert post.bodies[1] == whole_body
+
+    clear_full_body_urls()
+    assert not full_body_urls
+
+
+@pytest.mark.asyncio
+async def test_paginate_renews_search_id_of_reduced_body(monkeypatch: pytest.MonkeyPatch, full_body_urls: Set[str]) -> None:
+    post = fake_post(monkeypatch, [page([1], 1), expired_search_id(), expired_search_id(), page([2], 2, has_more=False)])
+    assert await query(retry_on=_renew_expired_search_id()) == [1, 2]
+    assert post.bodies[1] == {"max_count": 2, "cursor": 1, "search_id": "1"}
+    assert post.bodies[2] == {"query": {"and": []}, "max_count": 2, "cursor": 1, "search_id": "1"}
+    assert post.bodies[3] == {"query": {"and": []}, "max_count": 2, "cursor": 1}
+    assert not full_body_urls
+
+
+@pytest.mark.asyncio
+async def test_paginate_raises_after_max_retries(monkeypatch: pytest.MonkeyPatch, full_body_urls: Set[str]) -> None:
+    post = fake_post(monkeypatch, [bad_request() for _ in range(MAX_PAGE_RETRIES + 1)])
+    with pytest.raises(TikTokAPIError):
+        await query(retry_on=lambda error, body: True)
+    assert len(post.bodies) == MAX_PAGE_RETRIES + 1
+    assert not post.responses
+
+
+@pytest.mark.asyncio
+async def test_paginate_raises_unhandled_errors(monkeypatch: pytest.MonkeyPatch, full_body_urls: Set[str]) -> None:
+    post = fake_post(monkeypatch, [bad_request(), page([1], 1, has_more=False)])
+    with pytest.raises(TikTokAPIError):
+        await query(retry_on=_renew_expired_search_id())
+    assert len(post.bodies) == 1
+
+
+@pytest.mark.asyncio
+async def test_paginate_requests_one_page_ahead(monkeypatch: pytest.MonkeyPatch, full_body_urls: Set[str]) -> None:
+    post = fake_post(monkeypatch, [page([cursor], cursor) for cursor in range(5)])
+    body = {"query": {"and": []}, "max_count": 1}
+    async with aclosing(paginate(cast(aiohttp.ClientSession, None), URL, body, {}, {}, Page, "items")) as items:
+        async for _ in items:
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert len(post.bodies) == 2
+            break
+    assert len(post.bodies) == 2
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_paginate_checkpoints_processed_pages(monkeypatch: pytest.MonkeyPatch, full_body_urls: Set[str]) -> None:
+    post = fake_post(monkeypatch, [video_page(6), video_page(7), video_page(8, has_more=False)])
+    events: List[Tuple] = []
+
+    async def checkpoint(cursor: int, search_id: str) -> None:
+        events.append(("checkpoint", cursor, search_id, len(post.bodies)))
+
+    session = cast(aiohttp.ClientSession, None)
+    pages = query_videos_pages(
+        "token", {"and": []}, date(2024, 2, 1), date(2024, 2, 5), session=session, max_rps=None, resume_cursor=5, resume_search_id="7", checkpoint=checkpoint
+    )
+    async for videos in pages:
+        events.append(("page", [video.id for video in videos]))
+        await asyncio.sleep(0)
+        events.append(("processed", videos[0].id))
+
+    assert post.bodies[0]["cursor"] == 5
+    assert post.bodies[0]["search_id"] == "7"
+    # Each checkpoint follows the processed page, although the page after it has already been requested.
+    assert events == [
+        ("page", [6]),
+        ("processed", 6),
+        ("checkpoint", 6, "7", 2),
+        ("page", [7]),
+        ("processed", 7),
+        ("checkpoint", 7, "7", 3),
+        ("page", [8]),
+        ("processed", 8),
+    ]
@@ -0,0 +1,55 @@
+import pytest
+
+import sparta.tiktokapi.ratelimit
+from sparta.tiktokapi.ratelimit import RateLimiter, get_rate_limiter
+from tests.conftest import Clock
+
+
+@pytest.fixture
+def clock(clock: Clock, monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock.patch(sparta.tiktokapi.ratelimit, sleep=True)
+    monkeypatch.setattr(sparta.tiktokapi.ratelimit, "_rate_limiters", {})
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests(clock: Clock) -> None:
+    rate_limiter = RateLimiter(max_rps=4)
+    for _ in range(3):
+        await rate_limiter.acquire()
+    assert clock.sleeps == [0.25, 0.5]
+
+
+def test_rate_limiter_halves_rate_down_to_min_rps(clock: Clock) -> None:
+    rate_limiter = RateLimiter(max_rps=4, min_rps=1.5)
+    rate_limiter.decrease()
+    assert rate_limiter.rate == 2
+    rate_limiter.decrease()
+    assert rate_limiter.rate == 1.5
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_recovers_additively(clock: Clock) -> None:
+    rate_limiter = RateLimiter(max_rps=8, recovery=30)
+    rate_limiter.decrease()
+    rate_limiter.decrease()
+    assert rate_limiter.rate == 2
+
+    clock.now += 29
+    await rate_limiter.acquire()
+    assert rate_limiter.rate == 2
+
+    clock.now += 31
+    await rate_limiter.acquire()
+    assert rate_limiter.rate == 4
+
+    clock.now += 600
+    await rate_limiter.acquire()
+    assert rate_limiter.rate == 8
+
+
+def test_get_rate_limiter_keeps_settings(clock: Clock) -> None:
+    rate_limiter = get_rate_limiter("token", 2)
+    assert get_rate_limiter("token", 10) is rate_limiter
+    assert rate_limiter.max_rps == 2
+    assert get_rate_limiter("other token", 10) is not rate_limiter
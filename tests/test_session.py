@@ -0,0 +1,131 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, cast
+
+import aiohttp
+import orjson
+import pytest
+
+import sparta.tiktokapi.session
+from sparta.tiktokapi.exceptions import TikTokAPIError
+from sparta.tiktokapi.session import BACKOFF_BASE, BACKOFF_CAP, close_session, get_session, post_with_retry, retry_delay
+
+
+def test_shared_session_in_several_event_loops() -> None:
+    async def use_session() -> aiohttp.ClientSession:
+        session = await get_session()
+        assert await get_session() is session
+        _, new_session = await asyncio.gather(close_session(), get_session())
+        assert new_session is not session
+        await close_session()
+        return session
+
+    first_session = asyncio.run(use_session())
+    second_session = asyncio.run(use_session())
+    assert first_session is not second_session
+    assert first_session.closed and second_session.closed
+
+
+def response_with(headers: Dict[str, str]) -> aiohttp.ClientResponse:
+    return cast(aiohttp.ClientResponse, SimpleNamespace(headers=headers))
+
+
+def test_retry_delay_numeric_retry_after() -> None:
+    assert retry_delay(response_with({"Retry-After": "7"}), 0) == 7.0
+
+
+def test_retry_delay_http_date_retry_after() -> None:
+    retry_after = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28 <= retry_delay(response_with({"Retry-After": retry_after}), 0) <= 30
+
+
+def test_retry_delay_past_http_date_retry_after() -> None:
+    retry_after = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert retry_delay(response_with({"Retry-After": retry_after}), 0) == 0.0
+
+
+def test_retry_delay_invalid_retry_after() -> None:
+    assert BACKOFF_BASE <= retry_delay(response_with({"Retry-After": "soon"}), 0) <= 2 * BACKOFF_BASE
+
+
+def test_retry_delay_exponential_backoff_with_jitter() -> None:
+    for attempt in range(4):
+        for _ in range(100):
+            delay = retry_delay(None, attempt)
+            assert BACKOFF_BASE * 2**attempt <= delay <= BACKOFF_BASE * 2**attempt + BACKOFF_BASE
+
+
+def test_retry_delay_cap() -> None:
+    for _ in range(100):
+        assert BACKOFF_CAP <= retry_delay(None, 20) <= BACKOFF_CAP + BACKOFF_BASE
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: Any) -> None:
+        self.status = status
+        self.ok = status < 400
+        self.headers: Dict[str, str] = {}
+        self.body = orjson.dumps(body)
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def __aenter__(self) -> "FakeResponse":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class FakeSession:
+    """Answers each POST with the next response, raising it if it is an exception."""
+
+    def __init__(self, responses: List[Any]) -> None:
+        self.responses = responses
+        self.posts = 0
+
+    def post(self, url: str, **kwargs: Any) -> FakeResponse:
+        self.posts += 1
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return cast(FakeResponse, response)
+
+
+@pytest.fixture
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sparta.tiktokapi.session, "retry_delay", lambda response, attempt: 0.0)
+
+
+async def post(session: FakeSession, max_attempts: Optional[int] = 3) -> Dict:
+    return await post_with_retry(cast(aiohttp.ClientSession, session), "https://example.com/", max_attempts=max_attempts, json={"a": 1})
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("no_retry_delay")
+async def test_post_with_retry_retries_client_errors() -> None:
+    session = FakeSession([asyncio.TimeoutError(), aiohttp.ClientConnectionError("reset"), FakeResponse(200, {"data": 1})])
+    assert await post(session) == {"data": 1}
+    assert session.posts == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("no_retry_delay")
+async def test_post_with_retry_wraps_client_errors() -> None:
+    session = FakeSession([asyncio.TimeoutError(), asyncio.TimeoutError()])
+    with pytest.raises(TikTokAPIError) as error:
+        await post(session, max_attempts=2)
+    assert error.value.status is None
+    assert isinstance(error.value.__cause__, asyncio.TimeoutError)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("no_retry_delay")
+async def test_post_with_retry_raises_client_http_errors() -> None:
+    session = FakeSession([FakeResponse(403, {"error": {}})])
+    with pytest.raises(TikTokAPIError) as error:
+        await post(session)
+    assert error.value.status == 403
+    assert session.posts == 1
@@ -1,31 +1,27 @@
-import os
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
+import aiohttp
 import pytest
 
-from sparta.tiktokapi.access import create_bearer_token
 from sparta.tiktokapi.models.model import VideoObject
-from sparta.tiktokapi.users.videos import query_user_pinned_videos
+from sparta.tiktokapi.users.videos import query_user_pinned_videos, to_unix_timestamp
 
 # from sparta.tiktokapi.users.videos import query_user_liked_videos, query_user_pinned_videos, query_user_reposted_videos
 
-client_key = os.getenv("CLIENT_KEY", "")
-client_secret = os.getenv("CLIENT_SECRET", "")
-bearer_token = create_bearer_token(client_key, client_secret)
 start_time = datetime(2024, 1, 1)
 
 
-@pytest.mark.asyncio
-async def test_query_user_pinned_videos() -> None:
+@pytest.mark.asyncio(loop_scope="module")
+async def test_query_user_pinned_videos(bearer_token: str, session: aiohttp.ClientSession) -> None:
     username = "dfb"
-    async for video in query_user_pinned_videos(bearer_token, username, start_time):
+    async for video in query_user_pinned_videos(bearer_token, username, start_time, session=session):
         assert isinstance(video, VideoObject)
         break
 
 
 # Looking for a user with liked and reposted videos
 # @pytest.mark.asyncio
-# async def test_query_user_liked_videos() -> None:
+# async def test_query_user_liked_videos(bearer_token: str) -> None:
 #     username = "dfb"
 #     async for video in query_user_liked_videos(bearer_token, username, start_time):
 #         assert isinstance(video, VideoObject)
@@ -33,8 +29,17 @@ async def test_query_user_pinned_videos() -> None:
 
 
 # @pytest.mark.asyncio
-# async def test_query_user_reposted_videos() -> None:
+# async def test_query_user_reposted_videos(bearer_token: str) -> None:
 #     username = "dfb"
 #     async for video in query_user_reposted_videos(bearer_token, username, start_time):
 #         assert isinstance(video, VideoObject)
 #         break
+
+
+def test_to_unix_timestamp_naive() -> None:
+    assert to_unix_timestamp(datetime(2024, 1, 1)) == 1704067200
+
+
+def test_to_unix_timestamp_aware() -> None:
+    assert to_unix_timestamp(datetime(2024, 1, 1, tzinfo=timezone.utc)) == 1704067200
+    assert to_unix_timestamp(datetime(2024, 1, 1, 2, tzinfo=timezone(timedelta(hours=2)))) == 1704067200
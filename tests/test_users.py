@@ -1,33 +1,39 @@
-import os
-
 import pytest
 
-from sparta.tiktokapi.access import create_bearer_token
 from sparta.tiktokapi.models.model import UserFollowerInfoObject, UserInfoObject
-from sparta.tiktokapi.users.user import query_user_followers, query_user_following, query_user_info
-
-client_key = os.getenv("CLIENT_KEY", "")
-client_secret = os.getenv("CLIENT_SECRET", "")
+from sparta.tiktokapi.users.user import query_many_user_info, query_user_followers, query_user_following, query_user_info
 
-bearer_token = create_bearer_token(client_key, client_secret)
 username = "tiktok"
 
 
 @pytest.mark.asyncio
-async def test_query_user_info() -> None:
+async def test_query_user_info(bearer_token: str) -> None:
     user = await query_user_info(bearer_token, username)
     assert isinstance(user, UserInfoObject)
 
 
 @pytest.mark.asyncio
-async def test_query_user_followers() -> None:
+async def test_query_many_user_info(bearer_token: str) -> None:
+    users = await query_many_user_info(bearer_token, [username, username])
+    assert [name for name, _ in users] == [username, username]
+    assert all(isinstance(user, UserInfoObject) for _, user in users)
+
+
+@pytest.mark.asyncio
+async def test_query_many_user_info_rejects_no_concurrency() -> None:
+    with pytest.raises(ValueError):
+        await query_many_user_info("token", [username], concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_query_user_followers(bearer_token: str) -> None:
     async for user in query_user_followers(bearer_token, username):
         assert isinstance(user, UserFollowerInfoObject)
         break
 
 
 @pytest.mark.asyncio
-async def test_query_user_following() -> None:
+async def test_query_user_following(bearer_token: str) -> None:
     async for user in query_user_following(bearer_token, username):
         assert isinstance(user, UserFollowerInfoObject)
         break
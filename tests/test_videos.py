@@ -1,19 +1,30 @@
-import os
+import asyncio
+import logging
+from contextlib import aclosing
 from datetime import date
+from typing import Any, AsyncGenerator, Dict, List, cast
 
+import aiohttp
 import pytest
 
-from sparta.tiktokapi.access import create_bearer_token
+import sparta.tiktokapi.pagination
+import sparta.tiktokapi.videos.videos
+from sparta.tiktokapi.exceptions import TikTokAPIError
 from sparta.tiktokapi.models.model import CommentObject, VideoObject
-from sparta.tiktokapi.videos.videos import query_video_comments, query_videos
+from sparta.tiktokapi.videos.videos import (
+    QUERY_VIDEOS_URL,
+    is_expired_search_id,
+    query_video_comments,
+    query_video_comments_pages,
+    query_videos,
+    query_videos_many,
+    query_videos_pages,
+)
+from tests.test_pagination import EXPIRED_SEARCH_ID_BODY, FakePost, expired_search_id, video_page
 
-client_key = os.getenv("CLIENT_KEY", "")
-client_secret = os.getenv("CLIENT_SECRET", "")
-bearer_token = create_bearer_token(client_key, client_secret)
 
-
-@pytest.mark.asyncio
-async def test_query_videos() -> None:
+@pytest.mark.asyncio(loop_scope="module")
+async def test_query_videos(bearer_token: str, session: aiohttp.ClientSession) -> None:
     query = {
         "and": [
             {"operation": "IN", "field_name": "region_code", "field_values": ["JP", "US"]},
@@ -23,14 +34,157 @@ async def test_query_videos() -> None:
     start_date = date(2024, 2, 1)
     end_date = date(2024, 2, 5)
 
-    async for video in query_videos(bearer_token, query, start_date, end_date, max_count=10):
+    async for video in query_videos(bearer_token, query, start_date, end_date, max_count=10, session=session):
         assert isinstance(video, VideoObject)
         break
 
 
+@pytest.mark.asyncio(loop_scope="module")
+async def test_query_videos_pages(bearer_token: str, session: aiohttp.ClientSession) -> None:
+    query = {"and": [{"operation": "EQ", "field_name": "keyword", "field_values": ["animal"]}]}
+    start_date = date(2024, 2, 1)
+    end_date = date(2024, 2, 5)
+
+    async for videos in query_videos_pages(bearer_token, query, start_date, end_date, max_count=10, session=session):
+        assert all(isinstance(video, VideoObject) for video in videos)
+        break
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_query_videos_many(bearer_token: str, session: aiohttp.ClientSession) -> None:
+    queries = [
+        {"and": [{"operation": "EQ", "field_name": "keyword", "field_values": ["animal"]}]},
+        {"and": [{"operation": "EQ", "field_name": "keyword", "field_values": ["plant"]}]},
+    ]
+    start_date = date(2024, 2, 1)
+    end_date = date(2024, 2, 5)
+
+    async for query, video in query_videos_many(bearer_token, queries, start_date, end_date, max_count=10, session=session):
+        assert query in queries
+        assert isinstance(video, VideoObject)
+        break
+
+
+async def fake_query_videos_pages(bearer_token: str, query: Dict, *args: Any, **kwargs: Any) -> AsyncGenerator[List[VideoObject], None]:
+    """Yields ``query["pages"]`` pages of one video each, or endless pages if it is None, and then raises ``query["error"]`` if given."""
+    pages = query.get("pages")
+    page = 0
+    while pages is None or page < pages:
+        await asyncio.sleep(0)
+        yield [cast(VideoObject, page)]
+        page += 1
+    if "error" in query:
+        raise query["error"]
+
+
+def fake_query_videos_many(monkeypatch: pytest.MonkeyPatch, queries: List[Dict], concurrency: int = 4) -> AsyncGenerator:
+    monkeypatch.setattr(sparta.tiktokapi.videos.videos, "query_videos_pages", fake_query_videos_pages)
+    session = cast(aiohttp.ClientSession, object())
+    return query_videos_many("token", queries, date(2024, 2, 1), date(2024, 2, 5), concurrency=concurrency, session=session)
+
+
+def assert_no_other_tasks() -> None:
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_query_videos_many_yields_all_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    queries = [{"pages": 3}, {"pages": 0}, {"pages": 2}]
+    videos = [(query["pages"], video) async for query, video in fake_query_videos_many(monkeypatch, queries, concurrency=2)]
+    assert sorted(videos) == [(2, 0), (2, 1), (3, 0), (3, 1), (3, 2)]
+    assert_no_other_tasks()
+
+
+@pytest.mark.asyncio
+async def test_query_videos_many_rejects_no_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    with pytest.raises(ValueError):
+        async for _ in fake_query_videos_many(monkeypatch, [{"pages": 1}], concurrency=0):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_query_videos_many_cancels_queries_on_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    error = TikTokAPIError(400, "", "https://example.com/")
+    queries: List[Dict] = [{"pages": None}, {"pages": 2, "error": error}, {"pages": None}]
+
+    async def consume() -> None:
+        async for _ in fake_query_videos_many(monkeypatch, queries, concurrency=2):
+            pass
+
+    with pytest.raises(TikTokAPIError) as raised:
+        await asyncio.wait_for(consume(), timeout=5)
+    assert raised.value is error
+    assert_no_other_tasks()
+
+
 @pytest.mark.asyncio
-async def test_query_video_comments() -> None:
+async def test_query_videos_many_cancels_queries_on_close(monkeypatch: pytest.MonkeyPatch) -> None:
+    queries = [{"pages": None}, {"pages": None}, {"pages": None}]
+
+    async def consume() -> None:
+        async with aclosing(fake_query_videos_many(monkeypatch, queries, concurrency=2)) as videos:
+            async for _ in videos:
+                break
+
+    await asyncio.wait_for(consume(), timeout=5)
+    assert_no_other_tasks()
+
+
+@pytest.mark.parametrize(
+    "status, body, expired",
+    [
+        (400, EXPIRED_SEARCH_ID_BODY, True),
+        (500, EXPIRED_SEARCH_ID_BODY, False),
+        (400, '{"error": {"code": "invalid_params", "message": "Invalid start_date", "log_id": "1"}}', False),
+        (400, "<html>Search Id 7 is invalid or expired</html>", False),
+        (400, '["Search Id 7 is invalid or expired"]', False),
+        (400, '{"error": "Search Id 7 is invalid or expired"}', False),
+    ],
+)
+def test_is_expired_search_id(status: int, body: str, expired: bool) -> None:
+    assert is_expired_search_id(TikTokAPIError(status, body, QUERY_VIDEOS_URL)) is expired
+
+
+async def fake_query_videos_pages_with(monkeypatch: pytest.MonkeyPatch, responses: List[Any]) -> FakePost:
+    post = FakePost(responses)
+    monkeypatch.setattr(sparta.tiktokapi.pagination, "post_with_retry", post)
+    monkeypatch.setattr(sparta.tiktokapi.pagination, "retry_delay", lambda response, attempt: 0.0)
+    monkeypatch.setattr(sparta.tiktokapi.pagination, "_full_body_urls", set())
+    session = cast(aiohttp.ClientSession, object())
+    async for _ in query_videos_pages("token", {"and": []}, date(2024, 2, 1), date(2024, 2, 5), max_count=1, session=session, max_rps=None):
+        pass
+    return post
+
+
+@pytest.mark.asyncio
+async def test_query_videos_pages_retries_same_search_id(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    post = await fake_query_videos_pages_with(monkeypatch, [video_page(1), expired_search_id(), video_page(2, has_more=False)])
+    assert len(post.bodies) == 3
+    assert post.bodies[2]["search_id"] == "7"
+    assert post.bodies[2]["cursor"] == 1
+    assert all(record.levelno < logging.ERROR for record in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_query_videos_pages_renews_expired_search_id(monkeypatch: pytest.MonkeyPatch) -> None:
+    post = await fake_query_videos_pages_with(monkeypatch, [video_page(1), expired_search_id(), expired_search_id(), video_page(2, has_more=False)])
+    assert len(post.bodies) == 4
+    assert post.bodies[2]["search_id"] == "7"
+    assert "search_id" not in post.bodies[3]
+    assert post.bodies[3]["cursor"] == 1
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_query_video_comments(bearer_token: str, session: aiohttp.ClientSession) -> None:
     video_id = 7388519845278567712
-    async for comment in query_video_comments(bearer_token, video_id):
+    async for comment in query_video_comments(bearer_token, video_id, session=session):
         assert isinstance(comment, CommentObject)
         break
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_query_video_comments_pages(bearer_token: str, session: aiohttp.ClientSession) -> None:
+    video_id = 7388519845278567712
+    async for comments in query_video_comments_pages(bearer_token, video_id, session=session):
+        assert all(isinstance(comment, CommentObject) for comment in comments)
+        break